@@ -168,6 +168,10 @@ class BaseAgent:
     async def _auto_loop(self) -> None:
         """Fast loop: execute pending LLM decisions or auto skills."""
         while self.engine.is_running:
+            if self.engine.is_paused:
+                # Keep queued decisions; nothing can be cast until resume
+                await asyncio.sleep(AUTO_LOOP_INTERVAL)
+                continue
             try:
                 entity = self._get_entity()
                 if entity and getattr(entity, "alive", True) and entity.gcd_ready():
@@ -205,6 +209,10 @@ class BaseAgent:
         await asyncio.sleep(1.0)
 
         while self.engine.is_running:
+            if self.engine.is_paused:
+                # No LLM calls against a frozen fight; a command seen now is handled on resume
+                await asyncio.sleep(AUTO_LOOP_INTERVAL)
+                continue
             try:
                 entity = self._get_entity()
                 if entity and getattr(entity, "alive", True):
@@ -3,21 +3,102 @@
 from __future__ import annotations
 
 import random
-from typing import Any
+from dataclasses import dataclass
+from typing import Any, Callable
 
-from game.character import Buff, Character, Debuff
+from game.character import Buff, Cast, Character, Debuff
 from game.events import (
-    COMBAT_LOG, DAMAGE, DEATH, PHASE_CHANGE, SUMMON, EventBus,
+    COMBAT_LOG, DAMAGE, DAMAGE_BATCH, DEATH, PHASE_CHANGE, SUMMON, EventBus,
 )
-from game.skills import ROLE_SKILLS, SkillDef
+from game.skills import ALL_SKILLS, ROLE_SKILLS, SkillDef
 
 GCD_DURATION = 1.5
 
+# Cooldown keys are serialized as strings; skill ids are a fixed set
+_SKILL_ID_STR: dict[int, str] = {s.id: str(s.id) for s in ALL_SKILLS}
 
-class MoltenElemental:
+
+def _attack_mult(phase: int, enraged: bool) -> float:
+    mult = 1.0
+    if phase >= 2:
+        mult += 0.25  # P2: +25%
+    if phase >= 3:
+        mult += 0.40  # P3: +40% more
+    if enraged:
+        mult += 0.5
+    return mult
+
+
+# Phase-derived stat tables, folded once at import: (phase, enraged) -> attack
+# multiplier, and phase -> attack interval multiplier (P3: 30% faster).
+_ATTACK_MULT: dict[tuple[int, bool], float] = {
+    (phase, enraged): _attack_mult(phase, enraged) for phase in (1, 2, 3) for enraged in (False, True)
+}
+_ATTACK_SPEED_MULT: dict[int, float] = {1: 1.0, 2: 1.0, 3: 0.7}
+# phase -> hp fraction at or below which the next transition fires (-1.0: none left)
+_NEXT_PHASE_PCT: dict[int, float] = {1: 0.6, 2: 0.3, 3: -1.0}
+
+
+@dataclass(slots=True)
+class Fissure:
+    """Lava fissure under one character: ticking damage while it lasts."""
+    target: Character  # resolved once when the fissure is placed
+    duration: float  # remaining seconds
+    damage_per_tick: float  # per second; scaled by dt each tick
+    name: str = "熔岩裂隙"
+
+    @property
+    def target_id(self) -> str:
+        return self.target.id
+
+
+@dataclass(slots=True)
+class Trap:
+    """Lava trap marking one character: single hit when the countdown ends."""
+    target: Character  # resolved once when the trap is placed
+    countdown: float  # seconds until detonation
+    damage: int
+    name: str = "熔岩陷阱"
+
+    @property
+    def target_id(self) -> str:
+        return self.target.id
+
+
+class _Damageable:
+    """Shared hp/alive damage handling for the boss and its adds."""
+
+    __slots__ = ()
+
+    def take_damage(self, amount: int) -> int:
+        if not self.alive:
+            return 0
+        # Clamped to [0, hp] so hp never goes negative (conditionals, not min/max calls)
+        hp = self.hp
+        actual = amount if amount > 0 else 0
+        if actual > hp:
+            actual = hp
+        self.hp = hp - actual
+        if self.hp == 0:
+            self.alive = False
+            self._on_killed()
+        return actual
+
+    def _on_killed(self) -> None:
+        pass
+
+
+class MoltenElemental(_Damageable):
     """Summoned add in Phase 2."""
 
-    def __init__(self, add_id: str) -> None:
+    __slots__ = (
+        "id", "name", "max_hp", "hp", "alive",
+        "attack_damage", "attack_cooldown", "attack_timer", "buffs", "debuffs", "_on_death",
+    )
+
+    casting = None  # adds never cast; lets combat treat every enemy alike
+
+    def __init__(self, add_id: str, on_death: Callable[[MoltenElemental], None] | None = None) -> None:
         self.id = add_id
         self.name = "熔岩元素"
         self.max_hp = 4000
@@ -26,39 +107,38 @@ class MoltenElemental:
         self.attack_damage = 150
         self.attack_cooldown = 2.5
         self.attack_timer = 0.0
-        self.debuffs: list[Debuff] = []
+        self.buffs: dict[str, Buff] = {}  # always empty; same reason as casting
+        self.debuffs: dict[str, Debuff] = {}
+        # Called once when the add dies (Boss uses it to keep live_adds current)
+        self._on_death = on_death
 
-    def take_damage(self, amount: int) -> int:
-        if not self.alive:
-            return 0
-        actual = min(self.hp, max(0, amount))
-        self.hp -= actual
-        if self.hp <= 0:
-            self.hp = 0
-            self.alive = False
-        return actual
+    def _on_killed(self) -> None:
+        if self._on_death is not None:
+            self._on_death(self)
 
     def has_debuff(self, debuff_id: str) -> bool:
-        return any(d.debuff_id == debuff_id for d in self.debuffs)
+        return debuff_id in self.debuffs
 
     def get_debuff(self, debuff_id: str) -> Debuff | None:
-        for d in self.debuffs:
-            if d.debuff_id == debuff_id:
-                return d
-        return None
+        return self.debuffs.get(debuff_id)
 
     def add_debuff(self, debuff: Debuff) -> None:
-        self.debuffs = [d for d in self.debuffs if d.debuff_id != debuff.debuff_id]
-        self.debuffs.append(debuff)
+        # Re-applying moves the debuff to the end, as the old list did
+        self.debuffs.pop(debuff.debuff_id, None)
+        self.debuffs[debuff.debuff_id] = debuff
 
     def tick_timers(self, dt: float) -> None:
-        self.attack_timer = max(0, self.attack_timer - dt)
-        remaining = []
-        for d in self.debuffs:
+        if self.attack_timer > 0:
+            self.attack_timer = max(0, self.attack_timer - dt)
+        if not self.debuffs:
+            return
+        expired_ids = []
+        for did, d in self.debuffs.items():
             d.duration -= dt
-            if d.duration > 0:
-                remaining.append(d)
-        self.debuffs = remaining
+            if d.duration <= 0:
+                expired_ids.append(did)
+        for did in expired_ids:
+            del self.debuffs[did]
 
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -72,11 +152,24 @@ class MoltenElemental:
         }
 
 
-class Boss:
+class Boss(_Damageable):
     """Ragnaros the Firelord - Character-compatible interface for Agent system."""
 
-    def __init__(self, event_bus: EventBus) -> None:
+    __slots__ = (
+        "event_bus", "_rng", "id", "name", "max_hp", "hp", "alive", "phase",
+        "base_attack_min", "base_attack_max", "attack_speed",
+        "gcd", "cooldowns", "_expired_scratch", "skills", "last_action", "_skills_card", "casting",
+        "buffs", "debuffs", "_effects_dirty", "_buffs_card", "_debuffs_card", "_debuffs_brief",
+        "adds", "live_adds", "live_adds_by_id", "fissures", "traps", "add_aoe_timer", "lava_pulse_timer",
+        "enraged", "enrage_timer", "_p2_active", "_p3_active",
+        "attack_min", "attack_max", "current_attack_speed", "_lava_interval", "_lava_dmg",
+        "_next_phase_pct",
+    )
+
+    def __init__(self, event_bus: EventBus, seed: int | None = None) -> None:
         self.event_bus = event_bus
+        # Per-boss RNG so encounters can be replayed deterministically from a seed
+        self._rng = random.Random(seed)
         self.id = "boss"
         self.name = "熔火之王拉格纳罗斯"
         self.max_hp = 80000
@@ -92,14 +185,22 @@ class Boss:
         # --- Character-compatible interface ---
         self.gcd: float = 0.0
         self.cooldowns: dict[int, float] = {}
+        # Reused by tick_timers to collect keys to delete (no per-tick list)
+        self._expired_scratch: list[Any] = []
         self.skills: list[SkillDef] = list(ROLE_SKILLS.get("boss", []))
         self.last_action: dict | None = None
+        # Skill list never changes, so serialize it once for to_card_dict
+        self._skills_card: list[dict[str, Any]] = [
+            {"id": s.id, "name": s.name, "cooldown": s.cooldown, "mana_cost": s.mana_cost,
+             "cast_time": s.cast_time, "description": s.description, "auto": s.auto}
+            for s in self.skills
+        ]
 
         # Casting state (same format as Character)
-        self.casting: dict[str, Any] | None = None
+        self.casting: Cast | None = None
 
         # Buffs on boss (e.g. fire shield)
-        self.buffs: list[Buff] = []
+        self.buffs: dict[str, Buff] = {}
 
         # Initial cooldowns — aggressive ramp up
         self.cooldowns[607] = 25.0  # 灭世之炎: first available ~25s
@@ -109,17 +210,27 @@ class Boss:
         self.cooldowns[610] = 18.0  # 火焰盾: first available ~18s
         self.cooldowns[611] = 10.0  # 熔火突刺: first available ~10s
 
-        # Phase 2 adds
+        # Phase 2 adds (all ever summoned) and the living subset, in summon order.
+        # live_adds / live_adds_by_id are maintained by each add's death hook,
+        # not rebuilt per tick.
         self.adds: list[MoltenElemental] = []
+        self.live_adds: list[MoltenElemental] = []
+        self.live_adds_by_id: dict[str, MoltenElemental] = {}
 
         # Phase 2/3 fissures
-        self.fissures: list[dict[str, Any]] = []
+        self.fissures: list[Fissure] = []
 
         # Phase 3 traps
-        self.traps: list[dict[str, Any]] = []
+        self.traps: list[Trap] = []
 
         # Debuffs on boss (from players)
-        self.debuffs: list[Debuff] = []
+        self.debuffs: dict[str, Debuff] = {}
+
+        # Serialized buffs/debuffs for to_dict/to_card_dict; rebuilt only after a change
+        self._effects_dirty: bool = True
+        self._buffs_card: list[dict[str, Any]] = []
+        self._debuffs_card: list[dict[str, Any]] = []
+        self._debuffs_brief: list[dict[str, Any]] = []
 
         # Environmental AOE timer for adds
         self.add_aoe_timer: float = 0.0
@@ -131,41 +242,23 @@ class Boss:
         self.enraged = False
         self.enrage_timer = 120.0
 
+        # Phase-derived stats (recomputed by _refresh_phase_stats on phase change / enrage)
+        self._p2_active: bool = False
+        self._p3_active: bool = False
+        self.attack_min: int = self.base_attack_min
+        self.attack_max: int = self.base_attack_max
+        self.current_attack_speed: float = self.attack_speed
+        self._lava_interval: float = 6.0
+        self._lava_dmg: int = 150
+        self._next_phase_pct: float = _NEXT_PHASE_PCT[1]
+
     # ------------------------------------------------------------------
     # Properties
     # ------------------------------------------------------------------
     @property
     def hp_percent(self) -> float:
-        return self.hp / self.max_hp if self.max_hp > 0 else 0
-
-    @property
-    def attack_min(self) -> int:
-        mult = 1.0
-        if self.phase >= 2:
-            mult += 0.25
-        if self.phase >= 3:
-            mult += 0.40
-        if self.enraged:
-            mult += 0.5
-        return int(self.base_attack_min * mult)
-
-    @property
-    def attack_max(self) -> int:
-        mult = 1.0
-        if self.phase >= 2:
-            mult += 0.25
-        if self.phase >= 3:
-            mult += 0.40
-        if self.enraged:
-            mult += 0.5
-        return int(self.base_attack_max * mult)
-
-    @property
-    def current_attack_speed(self) -> float:
-        speed = self.attack_speed
-        if self.phase >= 3:
-            speed *= 0.7  # 30% faster
-        return speed
+        # max_hp is a fixed positive constant for the boss
+        return self.hp / self.max_hp
 
     # ------------------------------------------------------------------
     # Character-compatible interface
@@ -180,13 +273,15 @@ class Boss:
         return self.casting is not None
 
     def can_use_skill(self, skill: SkillDef) -> tuple[bool, str]:
-        if not self.alive:
-            return False, "Boss已死亡"
-        if self.is_casting():
-            return False, "正在施法中"
-        if self.is_on_gcd():
+        # One combined test for the common blocked-by-GCD/cast case; the
+        # reason is resolved in the original priority order only on failure.
+        if self.gcd > 0 or self.casting is not None or not self.alive:
+            if not self.alive:
+                return False, "Boss已死亡"
+            if self.casting is not None:
+                return False, "正在施法中"
             return False, "全局冷却中"
-        if self.has_debuff("freeze"):
+        if "freeze" in self.debuffs:
             return False, "被冻结"
         cd = self.cooldowns.get(skill.id, 0)
         if cd > 0:
@@ -204,60 +299,73 @@ class Boss:
         pass  # Boss has no resource
 
     def start_cast(self, skill: SkillDef, target: str) -> None:
-        self.casting = {"skill": skill, "target": target, "remaining": skill.cast_time}
+        self.casting = Cast(skill, target, skill.cast_time)
+
+    def roll_attack(self) -> int:
+        """Melee damage roll in [attack_min, attack_max] from the boss's own RNG."""
+        return self._rng.randrange(self.attack_min, self.attack_max + 1)
 
     # ------------------------------------------------------------------
-    # Take damage / debuffs
+    # Debuffs (take_damage comes from _Damageable)
     # ------------------------------------------------------------------
-    def take_damage(self, amount: int) -> int:
-        if not self.alive:
-            return 0
-        actual = min(self.hp, max(0, amount))
-        self.hp -= actual
-        if self.hp <= 0:
-            self.hp = 0
-            self.alive = False
-        return actual
-
     def has_debuff(self, debuff_id: str) -> bool:
-        return any(d.debuff_id == debuff_id for d in self.debuffs)
+        return debuff_id in self.debuffs
 
     def get_debuff(self, debuff_id: str) -> Debuff | None:
-        for d in self.debuffs:
-            if d.debuff_id == debuff_id:
-                return d
-        return None
+        return self.debuffs.get(debuff_id)
 
     def add_debuff(self, debuff: Debuff) -> None:
-        self.debuffs = [d for d in self.debuffs if d.debuff_id != debuff.debuff_id]
-        self.debuffs.append(debuff)
+        # Re-applying moves the debuff to the end, as the old list did
+        self.debuffs.pop(debuff.debuff_id, None)
+        self.debuffs[debuff.debuff_id] = debuff
+        self._effects_dirty = True
 
     # --- Buff management (e.g. fire shield) ---
     def has_buff(self, buff_id: str) -> bool:
-        return any(b.buff_id == buff_id for b in self.buffs)
+        return buff_id in self.buffs
 
     def get_buff(self, buff_id: str) -> Buff | None:
-        for b in self.buffs:
-            if b.buff_id == buff_id:
-                return b
-        return None
+        return self.buffs.get(buff_id)
 
     def add_buff(self, buff: Buff) -> None:
-        self.buffs = [b for b in self.buffs if b.buff_id != buff.buff_id]
-        self.buffs.append(buff)
+        self.buffs.pop(buff.buff_id, None)
+        self.buffs[buff.buff_id] = buff
+        self._effects_dirty = True
 
     def remove_buff(self, buff_id: str) -> Buff | None:
-        for i, b in enumerate(self.buffs):
-            if b.buff_id == buff_id:
-                return self.buffs.pop(i)
-        return None
+        self._effects_dirty = True
+        return self.buffs.pop(buff_id, None)
 
     # ------------------------------------------------------------------
     # Phase management
     # ------------------------------------------------------------------
+    def _refresh_phase_stats(self) -> None:
+        """Recompute phase-derived attack stats. Call whenever phase or enrage changes."""
+        self._p2_active = self.phase >= 2
+        self._p3_active = self.phase >= 3
+        mult = _ATTACK_MULT[(self.phase, self.enraged)]
+        self.attack_min = int(self.base_attack_min * mult)
+        self.attack_max = int(self.base_attack_max * mult)
+        self.current_attack_speed = self.attack_speed * _ATTACK_SPEED_MULT[self.phase]
+        self._next_phase_pct = _NEXT_PHASE_PCT[self.phase]
+        # Lava pulse (P2+): P3 is faster and harder, enrage is devastating
+        self._lava_interval = 6.0 if self.phase == 2 else 4.5
+        if self.enraged:
+            self._lava_dmg = 400
+        else:
+            self._lava_dmg = 150 if self.phase == 2 else 250
+
+    def force_phase(self, phase: int) -> None:
+        """Set the phase directly (God command) without triggering entry effects."""
+        self.phase = phase
+        self._refresh_phase_stats()
+
     def check_phase_transition(self) -> bool:
+        pct = self.hp / self.max_hp
+        # One compare on almost every tick (always false once P3 is reached)
+        if pct > self._next_phase_pct:
+            return False
         old_phase = self.phase
-        pct = self.hp_percent
         if pct <= 0.3 and self.phase < 3:
             self.phase = 3
             self._enter_phase3()
@@ -273,6 +381,7 @@ class Boss:
         return False
 
     def _enter_phase2(self) -> None:
+        self._refresh_phase_stats()
         self.event_bus.emit(COMBAT_LOG, {
             "message": f"[Phase 2] {self.name}进入狂怒阶段! 攻击力提升30%!",
         })
@@ -283,6 +392,7 @@ class Boss:
         })
 
     def _enter_phase3(self) -> None:
+        self._refresh_phase_stats()
         self.event_bus.emit(COMBAT_LOG, {
             "message": f"[Phase 3] {self.name}进入灭世阶段! 攻击力+50%, 攻速+30%! 狂暴倒计时90秒!",
         })
@@ -291,51 +401,65 @@ class Boss:
     # ------------------------------------------------------------------
     # Timer ticking (called by engine each tick)
     # ------------------------------------------------------------------
-    def tick_timers(self, dt: float) -> list[str]:
-        """Advance GCD, cooldowns, debuffs. Returns expired debuff ids."""
-        expired: list[str] = []
+    def tick_timers(self, dt: float) -> list[tuple[str, str]]:
+        """Advance GCD, cooldowns, debuffs. Returns expired ("buff_id" | "debuff_id", id) pairs."""
+        expired: list[tuple[str, str]] = []
 
         # GCD
         if self.gcd > 0:
             self.gcd = max(0, self.gcd - dt)
 
-        # Cooldowns
-        for sid in list(self.cooldowns):
-            self.cooldowns[sid] -= dt
-            if self.cooldowns[sid] <= 0:
-                del self.cooldowns[sid]
+        scratch = self._expired_scratch
+
+        # Cooldowns: decrement in place, then delete the finished ones
+        if self.cooldowns:
+            cooldowns = self.cooldowns
+            scratch.clear()
+            for sid, cd in cooldowns.items():
+                cd -= dt
+                if cd <= 0:
+                    scratch.append(sid)
+                else:
+                    cooldowns[sid] = cd
+            for sid in scratch:
+                del cooldowns[sid]
 
         # Casting
         if self.casting:
-            self.casting["remaining"] -= dt
-
-        # Buffs
-        remaining_buffs: list[Buff] = []
-        for b in self.buffs:
-            if b.duration is not None and b.duration > 0:
-                b.duration -= dt
-                if b.duration <= 0:
-                    expired.append(f"buff:{b.buff_id}")
-                    continue
-            remaining_buffs.append(b)
-        self.buffs = remaining_buffs
-
-        # Debuffs
-        remaining_debuffs: list[Debuff] = []
-        for d in self.debuffs:
-            if d.duration is not None and d.duration > 0:
-                d.duration -= dt
-                if d.duration <= 0:
-                    expired.append(f"debuff:{d.debuff_id}")
-                    continue
-            remaining_debuffs.append(d)
-        self.debuffs = remaining_debuffs
+            self.casting.remaining -= dt
+
+        # Buffs / debuffs: decrement in place, then drop whatever ran out.
+        # Nothing is copied on the common no-expiry tick.
+        if self.buffs or self.debuffs:
+            self._effects_dirty = True  # durations moved
+        if self.buffs:
+            scratch.clear()
+            for bid, b in self.buffs.items():
+                if b.duration is not None and b.duration > 0:
+                    b.duration -= dt
+                    if b.duration <= 0:
+                        scratch.append(bid)
+            for bid in scratch:
+                del self.buffs[bid]
+                expired.append(("buff_id", bid))
+
+        if self.debuffs:
+            scratch.clear()
+            for did, d in self.debuffs.items():
+                if d.duration is not None and d.duration > 0:
+                    d.duration -= dt
+                    if d.duration <= 0:
+                        scratch.append(did)
+            for did in scratch:
+                del self.debuffs[did]
+                expired.append(("debuff_id", did))
 
         # Enrage timer (P3)
-        if self.phase >= 3 and not self.enraged:
+        if self._p3_active and not self.enraged:
             self.enrage_timer = max(0, self.enrage_timer - dt)
             if self.enrage_timer <= 0:
                 self.enraged = True
+                self._refresh_phase_stats()
                 self.event_bus.emit(COMBAT_LOG, {
                     "message": f"[狂暴] {self.name}进入狂暴状态! 攻击力翻倍!",
                 })
@@ -347,120 +471,153 @@ class Boss:
     # ------------------------------------------------------------------
     def tick_passive(self, dt: float, characters: list[Character]) -> None:
         """Tick fissures, traps, adds, lava pulse - passive mechanics independent of Agent."""
-        if not self.alive:
+        # Nothing to hit once the party is wiped (the engine ends the fight this tick)
+        if not self.alive or not any(c.alive for c in characters):
             return
-        self._tick_fissures(dt, characters)
-        self._tick_traps(dt, characters)
-        self._tick_adds(dt, characters)
-        self._tick_lava_pulse(dt, characters)
-
-    def _tick_fissures(self, dt: float, characters: list[Character]) -> None:
-        remaining = []
-        for f in self.fissures:
-            f["duration"] -= dt
-            if f["duration"] > 0:
-                remaining.append(f)
-                for c in characters:
-                    if c.id == f["target_id"] and c.alive:
-                        dmg = int(f["damage_per_tick"] * dt)
-                        actual = c.take_damage(dmg)
-                        if actual > 0:
-                            self.event_bus.emit(DAMAGE, {
-                                "source": "boss", "target": c.id,
-                                "skill": f["name"], "amount": actual, "is_dot": True,
-                            })
-                        if not c.alive:
-                            self.event_bus.emit(DEATH, {"target": c.id, "source": f["name"]})
-        self.fissures = remaining
-
-    def _tick_traps(self, dt: float, characters: list[Character]) -> None:
-        remaining = []
-        for trap in self.traps:
-            trap["countdown"] -= dt
-            if trap["countdown"] <= 0:
+        # Most of the fight has no hazards or adds up; skip those paths outright
+        if self.fissures:
+            self._tick_fissures(dt)
+        if self.traps:
+            self._tick_traps(dt)
+        if self.live_adds:
+            self._tick_adds(dt, characters)
+        elif self.add_aoe_timer:
+            self.add_aoe_timer = 0.0  # what _tick_adds does with fewer than two adds up
+        if self._p2_active:
+            self._tick_lava_pulse(dt, characters)
+
+    def _tick_fissures(self, dt: float) -> None:
+        # Tick down and compact expired fissures out in place (no new list per tick)
+        fissures = self.fissures
+        w = 0
+        for f in fissures:
+            f.duration -= dt
+            if f.duration > 0:
+                fissures[w] = f
+                w += 1
+        if w < len(fissures):
+            del fissures[w:]
+
+        hits: list[dict[str, Any]] = []
+        deaths: list[dict[str, Any]] = []
+        for f in fissures:
+            c = f.target
+            if c.alive:
+                actual = c.take_damage(int(f.damage_per_tick * dt))
+                if actual > 0:
+                    hits.append({
+                        "source": "boss", "target": c.id,
+                        "skill": f.name, "amount": actual, "is_dot": True,
+                    })
+                if not c.alive:
+                    deaths.append({"target": c.id, "source": f.name})
+        self.event_bus.emit_many(DAMAGE, hits)
+        self.event_bus.emit_many(DEATH, deaths)
+
+    def _tick_traps(self, dt: float) -> None:
+        traps = self.traps
+        w = 0
+        hits: list[dict[str, Any]] = []
+        deaths: list[dict[str, Any]] = []
+        messages: list[dict[str, Any]] = []
+        for trap in traps:
+            trap.countdown -= dt
+            if trap.countdown <= 0:
                 # Single-target: only damage the marked target
-                target_id = trap.get("target_id", "")
-                for c in characters:
-                    if c.id == target_id and c.alive:
-                        actual = c.take_damage(trap["damage"])
-                        if actual > 0:
-                            self.event_bus.emit(DAMAGE, {
-                                "source": "boss", "target": c.id,
-                                "skill": trap["name"], "amount": actual,
-                            })
-                        if not c.alive:
-                            self.event_bus.emit(DEATH, {"target": c.id, "source": trap["name"]})
-                        self.event_bus.emit(COMBAT_LOG, {
-                            "message": f"熔岩陷阱在{c.name}脚下爆炸! 造成{trap['damage']}伤害!",
+                c = trap.target
+                if c.alive:
+                    actual = c.take_damage(trap.damage)
+                    if actual > 0:
+                        hits.append({
+                            "source": "boss", "target": c.id,
+                            "skill": trap.name, "amount": actual,
                         })
-                        break
+                    if not c.alive:
+                        deaths.append({"target": c.id, "source": trap.name})
+                    messages.append({
+                        "message": f"熔岩陷阱在{c.name}脚下爆炸! 造成{trap.damage}伤害!",
+                    })
             else:
-                remaining.append(trap)
-        self.traps = remaining
+                # Compact survivors in place
+                traps[w] = trap
+                w += 1
+        if w < len(traps):
+            del traps[w:]
+        self.event_bus.emit_many(DAMAGE, hits)
+        self.event_bus.emit_many(DEATH, deaths)
+        self.event_bus.emit_many(COMBAT_LOG, messages)
 
     def _tick_adds(self, dt: float, characters: list[Character]) -> None:
-        for add in self.adds:
-            if not add.alive:
-                continue
-            add.tick_timers(dt)
-            if add.attack_timer <= 0:
-                living = [c for c in characters if c.alive]
-                if living:
-                    target = random.choice(living)
-                    actual = target.take_damage(add.attack_damage)
-                    add.attack_timer = add.attack_cooldown
-                    if actual > 0:
-                        self.event_bus.emit(DAMAGE, {
-                            "source": add.id, "target": target.id,
-                            "skill": "熔岩元素攻击", "amount": actual,
-                        })
-                    if not target.alive:
-                        self.event_bus.emit(DEATH, {"target": target.id, "source": add.name})
+        emit = self.event_bus.emit
+        randrange = self._rng.randrange
+        live_adds = self.live_adds
+        # Built once; kept current by dropping characters the adds kill
+        living = [c for c in characters if c.alive]
+        for add in live_adds:
+            # Adds rarely carry debuffs; only the attack timer moves on most ticks
+            if add.debuffs:
+                add.tick_timers(dt)
+            elif add.attack_timer > 0:
+                add.attack_timer = max(0, add.attack_timer - dt)
+            if add.attack_timer <= 0 and living:
+                target = living[randrange(len(living))]
+                actual = target.take_damage(add.attack_damage)
+                add.attack_timer = add.attack_cooldown
+                if actual > 0:
+                    emit(DAMAGE, {
+                        "source": add.id, "target": target.id,
+                        "skill": "熔岩元素攻击", "amount": actual,
+                    })
+                if not target.alive:
+                    emit(DEATH, {"target": target.id, "source": add.name})
+                    living.remove(target)
 
         # Environmental AOE: when 2+ adds alive, periodic AOE damage to all players
-        live_adds = [a for a in self.adds if a.alive]
         if len(live_adds) >= 2:
             self.add_aoe_timer += dt
             if self.add_aoe_timer >= 2.0:
                 self.add_aoe_timer = 0.0
                 aoe_damage = 60 * len(live_adds)
-                living = [c for c in characters if c.alive]
+                hits = []
+                deaths = []
                 for c in living:
                     actual = c.take_damage(aoe_damage)
                     if actual > 0:
-                        self.event_bus.emit(DAMAGE, {
-                            "source": "adds", "target": c.id,
-                            "skill": "熔岩环境灼烧", "amount": actual,
-                        })
+                        hits.append((c.id, actual))
                     if not c.alive:
-                        self.event_bus.emit(DEATH, {"target": c.id, "source": "熔岩环境灼烧"})
-                self.event_bus.emit(COMBAT_LOG, {
+                        deaths.append({"target": c.id, "source": "熔岩环境灼烧"})
+                if hits:
+                    emit(DAMAGE_BATCH, {"source": "adds", "skill": "熔岩环境灼烧", "hits": hits})
+                self.event_bus.emit_many(DEATH, deaths)
+                emit(COMBAT_LOG, {
                     "message": f"[熔岩灼烧] {len(live_adds)}个元素释放环境AOE! 全体受到{aoe_damage}伤害!",
                 })
         else:
             self.add_aoe_timer = 0.0
 
     def _tick_lava_pulse(self, dt: float, characters: list[Character]) -> None:
-        """P2+: Periodic lava pulse AOE to all players. Scales with phase."""
-        if self.phase < 2:
-            return
+        """P2+: Periodic lava pulse AOE to all players. Scales with phase.
+
+        Only called once the boss is in Phase 2 or later (see tick_passive).
+        """
         self.lava_pulse_timer += dt
-        interval = 6.0 if self.phase == 2 else 4.5  # P3 faster
-        pulse_dmg = 150 if self.phase == 2 else 250  # P3 harder
-        if self.enraged:
-            pulse_dmg = 400  # Enrage pulse is devastating
-        if self.lava_pulse_timer >= interval:
+        if self.lava_pulse_timer >= self._lava_interval:
+            pulse_dmg = self._lava_dmg
             self.lava_pulse_timer = 0.0
             living = [c for c in characters if c.alive]
+            hits = []
+            deaths = []
             for c in living:
                 actual = c.take_damage(pulse_dmg)
                 if actual > 0:
-                    self.event_bus.emit(DAMAGE, {
-                        "source": "boss", "target": c.id,
-                        "skill": "熔岩脉冲", "amount": actual, "is_dot": True,
-                    })
+                    hits.append((c.id, actual))
                 if not c.alive:
-                    self.event_bus.emit(DEATH, {"target": c.id, "source": "熔岩脉冲"})
+                    deaths.append({"target": c.id, "source": "熔岩脉冲"})
+            if hits:
+                self.event_bus.emit(DAMAGE_BATCH, {
+                    "source": "boss", "skill": "熔岩脉冲", "hits": hits, "is_dot": True,
+                })
+            self.event_bus.emit_many(DEATH, deaths)
             self.event_bus.emit(COMBAT_LOG, {
                 "message": f"[熔岩脉冲] 拉格纳罗斯释放熔岩脉冲! 全体受到{pulse_dmg}伤害!",
             })
@@ -472,19 +629,43 @@ class Boss:
         add_offset = len(self.adds)
         new_adds = []
         for i in range(count):
-            add = MoltenElemental(f"add_{add_offset + i}")
+            add = MoltenElemental(f"add_{add_offset + i}", self._on_add_death)
             self.adds.append(add)
+            self.live_adds.append(add)
+            self.live_adds_by_id[add.id] = add
             new_adds.append(add)
         self.event_bus.emit(SUMMON, {
             "boss": self.name, "summon": "熔岩元素", "count": count,
         })
         return new_adds
 
+    def _on_add_death(self, add: MoltenElemental) -> None:
+        self.live_adds.remove(add)
+        del self.live_adds_by_id[add.id]
+
     # ------------------------------------------------------------------
     # Serialization
     # ------------------------------------------------------------------
+    def _refresh_effect_cache(self) -> None:
+        """Rebuild the serialized buff/debuff lists used by to_dict/to_card_dict."""
+        self._buffs_card = [
+            {"id": b.buff_id, "name": b.name, "duration": round(b.duration, 2), "params": b.params}
+            for b in self.buffs.values()
+        ]
+        self._debuffs_card = [
+            {"id": d.debuff_id, "name": d.name, "duration": round(d.duration, 2), "params": d.params}
+            for d in self.debuffs.values()
+        ]
+        self._debuffs_brief = [
+            {"id": d["id"], "name": d["name"], "duration": d["duration"]}
+            for d in self._debuffs_card
+        ]
+        self._effects_dirty = False
+
     def to_dict(self) -> dict[str, Any]:
-        """Legacy format for backward compatibility."""
+        """Legacy format for backward compatibility (lists shared, read-only)."""
+        if self._effects_dirty:
+            self._refresh_effect_cache()
         return {
             "id": self.id,
             "name": self.name,
@@ -494,20 +675,17 @@ class Boss:
             "phase": self.phase,
             "alive": self.alive,
             "casting": {
-                "name": self.casting["skill"].name,
-                "remaining": round(self.casting["remaining"], 2),
+                "name": self.casting.skill.name,
+                "remaining": round(self.casting.remaining, 2),
             } if self.casting else None,
-            "debuffs": [
-                {"id": d.debuff_id, "name": d.name, "duration": round(d.duration, 2)}
-                for d in self.debuffs
-            ],
-            "adds": [a.to_dict() for a in self.adds if a.alive],
+            "debuffs": self._debuffs_brief,
+            "adds": [a.to_dict() for a in self.live_adds],
             "fissures": [
-                {"target": f["target_id"], "duration": round(f["duration"], 2)}
+                {"target": f.target_id, "duration": round(f.duration, 2)}
                 for f in self.fissures
             ],
             "traps": [
-                {"target": t["target_id"], "countdown": round(t["countdown"], 2)}
+                {"target": t.target_id, "countdown": round(t.countdown, 2)}
                 for t in self.traps
             ],
             "enraged": self.enraged,
@@ -515,7 +693,13 @@ class Boss:
         }
 
     def to_card_dict(self) -> dict[str, Any]:
-        """Return Character.to_dict()-compatible format for the 6-card UI."""
+        """Return Character.to_dict()-compatible format for the 6-card UI.
+
+        The skills/buffs/debuffs lists are shared between calls and must be
+        treated as read-only by callers.
+        """
+        if self._effects_dirty:
+            self._refresh_effect_cache()
         return {
             "id": self.id,
             "role": "boss",
@@ -526,38 +710,28 @@ class Boss:
             "max_mana": 0,
             "resource_name": "",
             "alive": self.alive,
-            "gcd": round(self.gcd, 2),
+            "gcd": self.gcd and round(self.gcd, 2),  # idle GCD (the common case) skips round
             "casting": {
-                "skill_name": self.casting["skill"].name,
-                "remaining": round(self.casting["remaining"], 2),
-                "target": self.casting["target"],
+                "skill_name": self.casting.skill.name,
+                "remaining": round(self.casting.remaining, 2),
+                "target": self.casting.target,
             } if self.casting else None,
-            "cooldowns": {str(k): round(v, 2) for k, v in self.cooldowns.items()},
-            "buffs": [
-                {"id": b.buff_id, "name": b.name, "duration": round(b.duration, 2), "params": b.params}
-                for b in self.buffs
-            ],
-            "debuffs": [
-                {"id": d.debuff_id, "name": d.name, "duration": round(d.duration, 2), "params": d.params}
-                for d in self.debuffs
-            ],
-            "skills": [
-                {"id": s.id, "name": s.name, "cooldown": s.cooldown, "mana_cost": s.mana_cost,
-                 "cast_time": s.cast_time, "description": s.description, "auto": s.auto}
-                for s in self.skills
-            ],
+            "cooldowns": {_SKILL_ID_STR[k]: round(v, 2) for k, v in self.cooldowns.items()},
+            "buffs": self._buffs_card,
+            "debuffs": self._debuffs_card,
+            "skills": self._skills_card,
             "last_action": self.last_action,
             # Boss-specific badges
             "phase": self.phase,
-            "adds_count": len([a for a in self.adds if a.alive]),
+            "adds_count": len(self.live_adds),
             "enraged": self.enraged,
             "enrage_timer": round(self.enrage_timer, 1) if self.phase >= 3 else None,
             "fissures": [
-                {"target": f["target_id"], "duration": round(f["duration"], 2)}
+                {"target": f.target_id, "duration": round(f.duration, 2)}
                 for f in self.fissures
             ],
             "traps": [
-                {"target": t["target_id"], "countdown": round(t["countdown"], 2)}
+                {"target": t.target_id, "countdown": round(t.countdown, 2)}
                 for t in self.traps
             ],
         }
@@ -2,14 +2,13 @@
 
 from __future__ import annotations
 
-import time
 from dataclasses import dataclass, field
 from typing import Any
 
 from game.skills import ROLE_SKILLS, SkillDef
 
 
-@dataclass
+@dataclass(slots=True)
 class Buff:
     buff_id: str
     name: str
@@ -18,7 +17,7 @@ class Buff:
     source: str = ""  # character_id that applied it
 
 
-@dataclass
+@dataclass(slots=True)
 class Debuff:
     debuff_id: str
     name: str
@@ -27,6 +26,14 @@ class Debuff:
     source: str = ""
 
 
+@dataclass(slots=True)
+class Cast:
+    """Cast in progress; the engine resolves it once remaining reaches 0."""
+    skill: SkillDef
+    target: str
+    remaining: float  # seconds
+
+
 # ---------------------------------------------------------------------------
 # Role config
 # ---------------------------------------------------------------------------
@@ -52,6 +59,15 @@ GCD_DURATION = 1.5  # seconds
 class Character:
     """Base character used by all roles."""
 
+    __slots__ = (
+        "id", "role", "name", "resource_name",
+        "max_hp", "hp", "max_mana", "mana", "alive",
+        "skills", "_skills_dict", "cooldowns", "_expired_scratch", "gcd", "casting",
+        "buffs", "debuffs", "_effects_dirty", "_buffs_dict", "_debuffs_dict",
+        "last_action", "_mana_regen_per_tick",
+        "_deadly_combo_energy",  # set by the engine when 致命连击 is spent
+    )
+
     def __init__(self, character_id: str, role: str) -> None:
         cfg = ROLE_CONFIG[role]
         self.id: str = character_id
@@ -66,16 +82,29 @@ class Character:
 
         self.alive: bool = True
         self.skills: list[SkillDef] = list(ROLE_SKILLS.get(role, []))
+        # Skill list never changes, so serialize it once for to_dict
+        self._skills_dict: list[dict[str, Any]] = [
+            {"id": s.id, "name": s.name, "cooldown": s.cooldown, "mana_cost": s.mana_cost,
+             "cast_time": s.cast_time, "description": s.description, "auto": s.auto}
+            for s in self.skills
+        ]
 
         # Cooldown tracking: skill_id -> remaining seconds
         self.cooldowns: dict[int, float] = {}
+        # Reused by tick_timers to collect keys to delete (no per-tick list)
+        self._expired_scratch: list[Any] = []
         # GCD remaining seconds
         self.gcd: float = 0.0
         # Casting state
-        self.casting: dict[str, Any] | None = None  # {"skill": SkillDef, "target": str, "remaining": float}
+        self.casting: Cast | None = None
 
-        self.buffs: list[Buff] = []
-        self.debuffs: list[Debuff] = []
+        # Active effects keyed by buff_id / debuff_id (insertion = application order)
+        self.buffs: dict[str, Buff] = {}
+        self.debuffs: dict[str, Debuff] = {}
+        # Serialized buffs/debuffs for to_dict; rebuilt only after a change
+        self._effects_dirty: bool = True
+        self._buffs_dict: list[dict[str, Any]] = []
+        self._debuffs_dict: list[dict[str, Any]] = []
 
         # Last action taken by the AI agent
         self.last_action: dict | None = None  # {"skill_name": str, "target": str, "reason": str, "source": "ai"|"auto"|"timeout", "time": float}
@@ -100,11 +129,13 @@ class Character:
         return self.casting is not None
 
     def can_use_skill(self, skill: SkillDef) -> tuple[bool, str]:
-        if not self.alive:
-            return False, "角色已死亡"
-        if self.is_casting():
-            return False, "正在施法中"
-        if self.is_on_gcd():
+        # One combined test for the common blocked-by-GCD/cast case; the
+        # reason is resolved in the original priority order only on failure.
+        if self.gcd > 0 or self.casting is not None or not self.alive:
+            if not self.alive:
+                return False, "角色已死亡"
+            if self.casting is not None:
+                return False, "正在施法中"
             return False, "全局冷却中"
         cd = self.cooldowns.get(skill.id, 0)
         if cd > 0:
@@ -119,29 +150,23 @@ class Character:
         return True, ""
 
     def has_buff(self, buff_id: str) -> bool:
-        return any(b.buff_id == buff_id for b in self.buffs)
+        return buff_id in self.buffs
 
     def has_debuff(self, debuff_id: str) -> bool:
-        return any(d.debuff_id == debuff_id for d in self.debuffs)
+        return debuff_id in self.debuffs
 
     def get_buff(self, buff_id: str) -> Buff | None:
-        for b in self.buffs:
-            if b.buff_id == buff_id:
-                return b
-        return None
+        return self.buffs.get(buff_id)
 
     def get_debuff(self, debuff_id: str) -> Debuff | None:
-        for d in self.debuffs:
-            if d.debuff_id == debuff_id:
-                return d
-        return None
+        return self.debuffs.get(debuff_id)
 
     # ------------------------------------------------------------------
     # Mutations
     # ------------------------------------------------------------------
     def start_cast(self, skill: SkillDef, target: str) -> None:
         """Begin casting a skill with a cast time."""
-        self.casting = {"skill": skill, "target": target, "remaining": skill.cast_time}
+        self.casting = Cast(skill, target, skill.cast_time)
 
     def consume_mana(self, skill: SkillDef) -> None:
         if skill.id == 404:
@@ -157,30 +182,29 @@ class Character:
             self.cooldowns[skill.id] = skill.cooldown
 
     def add_buff(self, buff: Buff) -> None:
-        # Refresh if same buff_id exists
-        self.buffs = [b for b in self.buffs if b.buff_id != buff.buff_id]
-        self.buffs.append(buff)
+        # Refresh if same buff_id exists (re-applied buff moves to the end)
+        self.buffs.pop(buff.buff_id, None)
+        self.buffs[buff.buff_id] = buff
+        self._effects_dirty = True
 
     def remove_buff(self, buff_id: str) -> Buff | None:
-        for i, b in enumerate(self.buffs):
-            if b.buff_id == buff_id:
-                return self.buffs.pop(i)
-        return None
+        self._effects_dirty = True
+        return self.buffs.pop(buff_id, None)
 
     def add_debuff(self, debuff: Debuff) -> None:
-        self.debuffs = [d for d in self.debuffs if d.debuff_id != debuff.debuff_id]
-        self.debuffs.append(debuff)
+        self.debuffs.pop(debuff.debuff_id, None)
+        self.debuffs[debuff.debuff_id] = debuff
+        self._effects_dirty = True
 
     def remove_debuff(self, debuff_id: str) -> Debuff | None:
-        for i, d in enumerate(self.debuffs):
-            if d.debuff_id == debuff_id:
-                return self.debuffs.pop(i)
-        return None
+        self._effects_dirty = True
+        return self.debuffs.pop(debuff_id, None)
 
     def remove_one_debuff(self) -> Debuff | None:
         """Remove the first harmful debuff (for dispel)."""
         if self.debuffs:
-            return self.debuffs.pop(0)
+            self._effects_dirty = True
+            return self.debuffs.pop(next(iter(self.debuffs)))
         return None
 
     def take_damage(self, amount: int) -> int:
@@ -188,28 +212,35 @@ class Character:
         if not self.alive:
             return 0
 
-        # Spell barrier absorbs one hit entirely
-        barrier = self.get_buff("spell_barrier")
-        if barrier:
-            charges = barrier.params.get("charges", 0)
-            if charges > 0:
-                barrier.params["charges"] = charges - 1
-                if barrier.params["charges"] <= 0:
-                    self.remove_buff("spell_barrier")
+        # Defensive buffs; most hits land on a target with none active
+        buffs = self.buffs
+        if buffs:
+            # Spell barrier absorbs one hit entirely
+            barrier = buffs.get("spell_barrier")
+            if barrier:
+                charges = barrier.params.get("charges", 0)
+                if charges > 0:
+                    barrier.params["charges"] = charges - 1
+                    if barrier.params["charges"] <= 0:
+                        self.remove_buff("spell_barrier")
+                    return 0
+
+            # Evasion avoids all attacks
+            if "evasion" in buffs:
                 return 0
 
-        # Evasion avoids all attacks
-        if self.has_buff("evasion"):
-            return 0
-
-        # Shield wall reduces damage
-        sw = self.get_buff("shield_wall")
-        if sw:
-            reduction = sw.params.get("damage_reduction", 0)
-            amount = int(amount * (1 - reduction))
+            # Shield wall reduces damage
+            sw = buffs.get("shield_wall")
+            if sw:
+                reduction = sw.params.get("damage_reduction", 0)
+                amount = int(amount * (1 - reduction))
 
-        actual = min(self.hp, max(0, amount))
-        self.hp -= actual
+        # Clamped to [0, hp] (conditionals, not min/max calls: this is the per-hit path)
+        hp = self.hp
+        actual = amount if amount > 0 else 0
+        if actual > hp:
+            actual = hp
+        self.hp = hp - actual
         if self.hp <= 0:
             self.hp = 0
             self.alive = False
@@ -220,7 +251,7 @@ class Character:
         if not self.alive:
             return 0
         # Check for healing reduction debuffs (e.g. 禁疗之焰)
-        for d in self.debuffs:
+        for d in self.debuffs.values():
             reduction = d.params.get("heal_reduction", 0)
             if reduction > 0:
                 amount = int(amount * (1 - reduction))
@@ -234,52 +265,70 @@ class Character:
         self.casting = None
         self.buffs.clear()
         self.debuffs.clear()
+        self._effects_dirty = True
 
     def resurrect(self, hp_percent: float = 0.3) -> None:
         self.alive = True
         self.hp = int(self.max_hp * hp_percent)
         self.mana = int(self.max_mana * 0.2)
 
-    def tick_timers(self, dt: float) -> list[str]:
-        """Advance all timers by dt seconds. Return list of expired buff/debuff ids."""
-        expired: list[str] = []
+    def tick_timers(self, dt: float) -> list[tuple[str, str]]:
+        """Advance all timers by dt seconds.
+
+        Returns ("buff_id" | "debuff_id", id) pairs for every effect that expired.
+        """
+        expired: list[tuple[str, str]] = []
 
         # GCD
         if self.gcd > 0:
             self.gcd = max(0, self.gcd - dt)
 
-        # Cooldowns
-        for sid in list(self.cooldowns):
-            self.cooldowns[sid] -= dt
-            if self.cooldowns[sid] <= 0:
-                del self.cooldowns[sid]
+        scratch = self._expired_scratch
+
+        # Cooldowns: decrement in place, then delete the finished ones
+        if self.cooldowns:
+            cooldowns = self.cooldowns
+            scratch.clear()
+            for sid, cd in cooldowns.items():
+                cd -= dt
+                if cd <= 0:
+                    scratch.append(sid)
+                else:
+                    cooldowns[sid] = cd
+            for sid in scratch:
+                del cooldowns[sid]
 
         # Casting
         if self.casting:
-            self.casting["remaining"] -= dt
+            self.casting.remaining -= dt
             # Casting is resolved in combat system when remaining <= 0
 
+        if self.buffs or self.debuffs:
+            self._effects_dirty = True  # durations moved
+
         # Buffs
-        remaining_buffs: list[Buff] = []
-        for b in self.buffs:
-            if b.duration is not None and b.duration > 0:
-                b.duration -= dt
-                if b.duration <= 0:
-                    expired.append(f"buff:{b.buff_id}")
-                    continue
-            remaining_buffs.append(b)
-        self.buffs = remaining_buffs
+        if self.buffs:
+            scratch.clear()
+            for bid, b in self.buffs.items():
+                if b.duration is not None and b.duration > 0:
+                    b.duration -= dt
+                    if b.duration <= 0:
+                        scratch.append(bid)
+            for bid in scratch:
+                del self.buffs[bid]
+                expired.append(("buff_id", bid))
 
         # Debuffs (DOTs handled separately in combat)
-        remaining_debuffs: list[Debuff] = []
-        for d in self.debuffs:
-            if d.duration is not None and d.duration > 0:
-                d.duration -= dt
-                if d.duration <= 0:
-                    expired.append(f"debuff:{d.debuff_id}")
-                    continue
-            remaining_debuffs.append(d)
-        self.debuffs = remaining_debuffs
+        if self.debuffs:
+            scratch.clear()
+            for did, d in self.debuffs.items():
+                if d.duration is not None and d.duration > 0:
+                    d.duration -= dt
+                    if d.duration <= 0:
+                        scratch.append(did)
+            for did in scratch:
+                del self.debuffs[did]
+                expired.append(("debuff_id", did))
 
         # Passive mana regen
         if self.alive:
@@ -291,6 +340,21 @@ class Character:
     # Serialization
     # ------------------------------------------------------------------
     def to_dict(self) -> dict[str, Any]:
+        """Serialize for agents and the UI.
+
+        The skills/buffs/debuffs lists are shared between calls and must be
+        treated as read-only by callers.
+        """
+        if self._effects_dirty:
+            self._buffs_dict = [
+                {"id": b.buff_id, "name": b.name, "duration": round(b.duration, 2), "params": b.params}
+                for b in self.buffs.values()
+            ]
+            self._debuffs_dict = [
+                {"id": d.debuff_id, "name": d.name, "duration": round(d.duration, 2), "params": d.params}
+                for d in self.debuffs.values()
+            ]
+            self._effects_dirty = False
         return {
             "id": self.id,
             "role": self.role,
@@ -301,16 +365,16 @@ class Character:
             "max_mana": self.max_mana,
             "resource_name": self.resource_name,
             "alive": self.alive,
-            "gcd": round(self.gcd, 2),
+            "gcd": self.gcd and round(self.gcd, 2),  # idle GCD (the common case) skips round
             "casting": {
-                "skill_name": self.casting["skill"].name,
-                "remaining": round(self.casting["remaining"], 2),
-                "target": self.casting["target"],
+                "skill_name": self.casting.skill.name,
+                "remaining": round(self.casting.remaining, 2),
+                "target": self.casting.target,
             } if self.casting else None,
             "cooldowns": {str(k): round(v, 2) for k, v in self.cooldowns.items()},
-            "buffs": [{"id": b.buff_id, "name": b.name, "duration": round(b.duration, 2), "params": b.params} for b in self.buffs],
-            "debuffs": [{"id": d.debuff_id, "name": d.name, "duration": round(d.duration, 2), "params": d.params} for d in self.debuffs],
-            "skills": [{"id": s.id, "name": s.name, "cooldown": s.cooldown, "mana_cost": s.mana_cost, "cast_time": s.cast_time, "description": s.description, "auto": s.auto} for s in self.skills],
+            "buffs": self._buffs_dict,
+            "debuffs": self._debuffs_dict,
+            "skills": self._skills_dict,
             "last_action": self.last_action,
         }
 
@@ -3,7 +3,8 @@
 from __future__ import annotations
 
 import random
-from typing import Any
+from collections import defaultdict
+from typing import Any, Callable
 
 from game.character import Buff, Character, Debuff
 from game.events import (
@@ -11,17 +12,28 @@ from game.events import (
 )
 from game.skills import SkillDef
 
+# Bound once: damage rolls are the hottest caller and skip the module lookup
+_rand = random.random
+
+# Effect keys that configure the skill itself rather than the applied buff/debuff
+_DAMAGE_DEBUFF_SKIP = frozenset(("type", "base_damage", "debuff_id", "duration"))
+_BUFF_SKIP = frozenset(("type", "buff_id", "duration"))
+_DEBUFF_SKIP = frozenset(("type", "debuff_id", "duration"))
+
 
 class ThreatTable:
     """Tracks threat (aggro) for each character against a target."""
 
+    __slots__ = ("_threat", "_taunt")
+
     def __init__(self) -> None:
-        self._threat: dict[str, float] = {}
+        # int() default: 0 + amount keeps the exact type the old .get(cid, 0) produced
+        self._threat: defaultdict[str, float] = defaultdict(int)
         # Taunt overrides: character_id -> remaining seconds
         self._taunt: dict[str, float] = {}
 
     def add_threat(self, character_id: str, amount: float) -> None:
-        self._threat[character_id] = self._threat.get(character_id, 0) + amount
+        self._threat[character_id] += amount
 
     def add_heal_threat(self, character_id: str, heal_amount: float) -> None:
         self.add_threat(character_id, heal_amount * 0.5)
@@ -35,30 +47,45 @@ class ThreatTable:
 
     def get_top_threat(self, alive_ids: set[str] | None = None) -> str | None:
         """Return the character_id with the highest threat."""
-        # If someone has an active taunt, they are forced first
-        for cid, remaining in sorted(self._taunt.items(), key=lambda x: -x[1]):
-            if remaining > 0 and (alive_ids is None or cid in alive_ids):
-                return cid
-
-        if not self._threat:
+        # If someone has an active taunt, they are forced first (longest remaining wins)
+        if self._taunt:
+            taunt_id: str | None = None
+            longest = 0.0
+            for cid, remaining in self._taunt.items():
+                if remaining > longest and (alive_ids is None or cid in alive_ids):
+                    taunt_id, longest = cid, remaining
+            if taunt_id is not None:
+                return taunt_id
+
+        # A lone survivor is the answer if they have any threat at all
+        if alive_ids is not None and len(alive_ids) <= 1:
+            for cid in alive_ids:
+                return cid if cid in self._threat else None
             return None
 
-        candidates = self._threat
-        if alive_ids is not None:
-            candidates = {k: v for k, v in self._threat.items() if k in alive_ids}
-        if not candidates:
-            return None
-        return max(candidates, key=candidates.get)
+        # Single pass, no filtered copy; ties keep the earliest entry like max() did
+        top_id: str | None = None
+        top = 0.0
+        for cid, value in self._threat.items():
+            if (alive_ids is None or cid in alive_ids) and (top_id is None or value > top):
+                top_id, top = cid, value
+        return top_id
 
     def tick(self, dt: float) -> None:
         """Reduce taunt timers."""
+        taunt = self._taunt
+        if not taunt:
+            return
+        # Decrement in place, then delete the finished ones
         expired = []
-        for cid in list(self._taunt):
-            self._taunt[cid] -= dt
-            if self._taunt[cid] <= 0:
+        for cid, remaining in taunt.items():
+            remaining -= dt
+            if remaining <= 0:
                 expired.append(cid)
+            else:
+                taunt[cid] = remaining
         for cid in expired:
-            del self._taunt[cid]
+            del taunt[cid]
 
     def get_threat_list(self) -> dict[str, float]:
         return dict(self._threat)
@@ -71,9 +98,26 @@ class ThreatTable:
 class CombatSystem:
     """Resolves skills, manages buffs/debuffs, and processes DOTs/HOTs."""
 
+    __slots__ = ("event_bus", "threat", "_resolvers", "_params_cache")
+
     def __init__(self, event_bus: EventBus) -> None:
         self.event_bus = event_bus
         self.threat = ThreatTable()
+        # Effect type -> resolver(caster, skill, target, eff), bound once.
+        # The two AOE types need the ally/enemy lists and are handled in resolve_skill.
+        self._resolvers: dict[str, Callable[[Character, SkillDef, Any, dict], dict]] = {
+            "damage": self._resolve_damage,
+            "heal": self._resolve_heal,
+            "taunt": lambda caster, skill, target, eff: self._resolve_taunt(caster, skill, eff),
+            "buff": self._resolve_buff,
+            "debuff": self._resolve_debuff,
+            "control": self._resolve_control,
+            "dispel": lambda caster, skill, target, eff: self._resolve_dispel(caster, skill, target),
+            "resurrect": self._resolve_resurrect,
+            "special": self._resolve_special,
+        }
+        # (skill id, skip keys) -> filtered effect params; SkillDef.effects never change
+        self._params_cache: dict[tuple[int, frozenset[str]], dict[str, Any]] = {}
 
     # ------------------------------------------------------------------
     # Skill resolution
@@ -90,30 +134,15 @@ class CombatSystem:
         result: dict[str, Any] = {"skill": skill.name, "caster": caster.id}
         eff = skill.effects
 
-        etype = eff.get("type", "")
+        etype = skill.effect_type
 
-        if etype == "damage":
-            result.update(self._resolve_damage(caster, skill, target, eff))
+        resolver = self._resolvers.get(etype)
+        if resolver is not None:
+            result.update(resolver(caster, skill, target, eff))
         elif etype == "damage_aoe":
             result.update(self._resolve_damage_aoe(caster, skill, all_enemies or [], eff))
-        elif etype == "heal":
-            result.update(self._resolve_heal(caster, skill, target, eff))
         elif etype == "heal_aoe":
             result.update(self._resolve_heal_aoe(caster, skill, all_allies or [], eff))
-        elif etype == "taunt":
-            result.update(self._resolve_taunt(caster, skill, eff))
-        elif etype == "buff":
-            result.update(self._resolve_buff(caster, skill, target, eff))
-        elif etype == "debuff":
-            result.update(self._resolve_debuff(caster, skill, target, eff))
-        elif etype == "control":
-            result.update(self._resolve_control(caster, skill, target, eff))
-        elif etype == "dispel":
-            result.update(self._resolve_dispel(caster, skill, target))
-        elif etype == "resurrect":
-            result.update(self._resolve_resurrect(caster, skill, target, eff))
-        elif etype == "special":
-            result.update(self._resolve_special(caster, skill, target, eff))
 
         return result
 
@@ -127,25 +156,24 @@ class CombatSystem:
         self.threat.add_threat(caster.id, actual)
 
         self.event_bus.emit(DAMAGE, {
-            "source": caster.id, "target": getattr(target, "id", "boss"),
+            "source": caster.id, "target": target.id,
             "skill": skill.name, "amount": actual,
         })
 
         # Fire shield reflection (Boss buff → reflect damage to attacker)
-        if hasattr(target, "has_buff") and target.has_buff("fire_shield"):
-            fs = target.get_buff("fire_shield")
-            if fs and actual > 0:
-                reflect_pct = fs.params.get("damage_reflect", 0)
-                reflect_dmg = int(actual * reflect_pct)
-                if reflect_dmg > 0 and hasattr(caster, "take_damage"):
-                    reflected = caster.take_damage(reflect_dmg)
-                    if reflected > 0:
-                        self.event_bus.emit(DAMAGE, {
-                            "source": "boss", "target": caster.id,
-                            "skill": "火焰盾反伤", "amount": reflected,
-                        })
-                    if not caster.alive:
-                        self.event_bus.emit(DEATH, {"target": caster.id, "source": "火焰盾"})
+        fs = target.buffs.get("fire_shield") if target.buffs else None
+        if fs and actual > 0:
+            reflect_pct = fs.params.get("damage_reflect", 0)
+            reflect_dmg = int(actual * reflect_pct)
+            if reflect_dmg > 0:
+                reflected = caster.take_damage(reflect_dmg)
+                if reflected > 0:
+                    self.event_bus.emit(DAMAGE, {
+                        "source": "boss", "target": caster.id,
+                        "skill": "火焰盾反伤", "amount": reflected,
+                    })
+                if not caster.alive:
+                    self.event_bus.emit(DEATH, {"target": caster.id, "source": "火焰盾"})
 
         # Apply DOT if present
         if eff.get("dot"):
@@ -158,7 +186,7 @@ class CombatSystem:
             )
             target.add_debuff(dot_debuff)
             self.event_bus.emit(BUFF_APPLY, {
-                "target": getattr(target, "id", "boss"),
+                "target": target.id,
                 "debuff_id": eff["dot_id"], "name": dot_debuff.name,
                 "duration": eff["dot_duration"],
             })
@@ -169,26 +197,39 @@ class CombatSystem:
                 debuff_id=eff["debuff_id"],
                 name=f"{skill.name}效果",
                 duration=eff.get("duration", 10),
-                params={k: v for k, v in eff.items() if k not in ("type", "base_damage", "debuff_id", "duration")},
+                params=self._effect_params(skill, _DAMAGE_DEBUFF_SKIP),
                 source=caster.id,
             )
             target.add_debuff(debuff)
 
-        return {"damage": actual, "target": getattr(target, "id", "boss")}
+        return {"damage": actual, "target": target.id}
+
+    def _effect_params(self, skill: SkillDef, skip: frozenset[str]) -> dict[str, Any]:
+        """Effect params minus ``skip``, filtered once per skill.
+
+        Returns a fresh copy: applied effects may mutate their params
+        (spell barrier counts its charges down in place).
+        """
+        key = (skill.id, skip)
+        params = self._params_cache.get(key)
+        if params is None:
+            params = self._params_cache[key] = {k: v for k, v in skill.effects.items() if k not in skip}
+        return params.copy()
 
     def _resolve_damage_aoe(self, caster: Character, skill: SkillDef, targets: list, eff: dict) -> dict:
         base = eff.get("base_damage", 0)
         total = 0
         hit_list = []
+        emit = self.event_bus.emit
         for t in targets:
-            if not getattr(t, "alive", True):
+            if not t.alive:
                 continue
             damage = self._calc_damage(base, caster, t)
             actual = t.take_damage(damage)
             total += actual
-            hit_list.append({"target": getattr(t, "id", "?"), "amount": actual})
-            self.event_bus.emit(DAMAGE, {
-                "source": caster.id, "target": getattr(t, "id", "?"),
+            hit_list.append({"target": t.id, "amount": actual})
+            emit(DAMAGE, {
+                "source": caster.id, "target": t.id,
                 "skill": skill.name, "amount": actual,
             })
         self.threat.add_threat(caster.id, total)
@@ -196,25 +237,24 @@ class CombatSystem:
 
     def _calc_damage(self, base: int, caster: Character, target: Any) -> int:
         """Calculate final damage considering buffs/debuffs."""
-        damage = base
-        # Random variance +/- 10%
-        damage = int(damage * random.uniform(0.9, 1.1))
-
-        # Hunter's mark on target
-        if hasattr(target, "has_debuff") and target.has_debuff("hunters_mark"):
-            mark = target.get_debuff("hunters_mark")
+        # Random variance +/- 10%; all multipliers fold into one float, one int() at the end
+        mult = 0.9 + _rand() * 0.2
+
+        # Boss, adds and characters all keep debuffs as a dict keyed by id
+        debuffs = target.debuffs
+        if debuffs:
+            # Hunter's mark on target
+            mark = debuffs.get("hunters_mark")
             if mark:
-                amp = mark.params.get("damage_amp", 0)
-                damage = int(damage * (1 + amp))
+                mult *= 1 + mark.params.get("damage_amp", 0)
 
-        # Sunder armor on target
-        if hasattr(target, "has_debuff") and target.has_debuff("sunder_armor"):
-            sa = target.get_debuff("sunder_armor")
+            # Sunder armor on target
+            sa = debuffs.get("sunder_armor")
             if sa:
-                reduction = sa.params.get("armor_reduction", 0)
-                damage = int(damage * (1 + reduction))
+                mult *= 1 + sa.params.get("armor_reduction", 0)
 
-        return max(1, damage)
+        damage = int(base * mult)
+        return damage if damage > 1 else 1
 
     # ------------------------------------------------------------------
     # Healing
@@ -233,13 +273,14 @@ class CombatSystem:
     def _resolve_heal_aoe(self, caster: Character, skill: SkillDef, targets: list[Character], eff: dict) -> dict:
         base = eff.get("base_heal", 0)
         total = 0
+        emit = self.event_bus.emit
         for t in targets:
             if not t.alive:
                 continue
             heal = int(base * random.uniform(0.95, 1.05))
             actual = t.receive_heal(heal)
             total += actual
-            self.event_bus.emit(HEAL, {
+            emit(HEAL, {
                 "source": caster.id, "target": t.id,
                 "skill": skill.name, "amount": actual,
             })
@@ -263,33 +304,33 @@ class CombatSystem:
             buff_id=eff["buff_id"],
             name=skill.name,
             duration=eff.get("duration", 9999),
-            params={k: v for k, v in eff.items() if k not in ("type", "buff_id", "duration")},
+            params=self._effect_params(skill, _BUFF_SKIP),
             source=caster.id,
         )
         buff_target.add_buff(buff)
         self.event_bus.emit(BUFF_APPLY, {
-            "target": getattr(buff_target, "id", "?"),
+            "target": buff_target.id,
             "buff_id": eff["buff_id"], "name": skill.name,
             "duration": eff.get("duration", 0),
         })
-        return {"buff": eff["buff_id"], "target": getattr(buff_target, "id", "?")}
+        return {"buff": eff["buff_id"], "target": buff_target.id}
 
     def _resolve_debuff(self, caster: Character, skill: SkillDef, target: Any, eff: dict) -> dict:
         debuff = Debuff(
             debuff_id=eff["debuff_id"],
             name=skill.name,
             duration=eff.get("duration", 10),
-            params={k: v for k, v in eff.items() if k not in ("type", "debuff_id", "duration")},
+            params=self._effect_params(skill, _DEBUFF_SKIP),
             source=caster.id,
         )
         target.add_debuff(debuff)
         self.threat.add_threat(caster.id, 50)  # debuff generates some threat
         self.event_bus.emit(BUFF_APPLY, {
-            "target": getattr(target, "id", "boss"),
+            "target": target.id,
             "debuff_id": eff["debuff_id"], "name": skill.name,
             "duration": eff.get("duration", 10),
         })
-        return {"debuff": eff["debuff_id"], "target": getattr(target, "id", "boss")}
+        return {"debuff": eff["debuff_id"], "target": target.id}
 
     def _resolve_control(self, caster: Character, skill: SkillDef, target: Any, eff: dict) -> dict:
         duration = eff.get("duration", 3)
@@ -303,12 +344,11 @@ class CombatSystem:
         target.add_debuff(debuff)
 
         # Interrupt casting
-        if hasattr(target, "casting") and target.casting is not None:
-            cast_skill = target.casting.get("skill")
-            interrupted_skill = getattr(cast_skill, "name", "") if cast_skill else target.casting.get("skill_name", "")
+        if target.casting is not None:
+            interrupted_skill = target.casting.skill.name
             target.casting = None
             self.event_bus.emit(COMBAT_LOG, {
-                "message": f"{caster.name}打断了{getattr(target, 'name', 'Boss')}的{interrupted_skill}",
+                "message": f"{caster.name}打断了{target.name}的{interrupted_skill}",
             })
 
         self.threat.add_threat(caster.id, 100)
@@ -338,19 +378,19 @@ class CombatSystem:
         sid = eff.get("special_id")
         if sid == "deadly_combo":
             # 3 hits, total damage = energy * damage_per_energy
-            energy_before = caster.mana  # mana already consumed, use snapshot from engine
             dpe = eff.get("damage_per_energy", 1.5)
             # The mana was already consumed, so we check the stored value
             energy = getattr(caster, "_deadly_combo_energy", caster.max_mana)
             total_damage = int(energy * dpe)
             per_hit = total_damage // 3
             total_actual = 0
+            emit = self.event_bus.emit
             for i in range(3):
                 dmg = self._calc_damage(per_hit, caster, target)
                 actual = target.take_damage(dmg)
                 total_actual += actual
-                self.event_bus.emit(DAMAGE, {
-                    "source": caster.id, "target": getattr(target, "id", "boss"),
+                emit(DAMAGE, {
+                    "source": caster.id, "target": target.id,
                     "skill": f"致命连击#{i+1}", "amount": actual,
                 })
             self.threat.add_threat(caster.id, total_actual)
@@ -362,16 +402,18 @@ class CombatSystem:
     # ------------------------------------------------------------------
     def process_dots(self, characters: list[Character], boss: Any, dt: float) -> None:
         """Process DOT damage on all entities each tick."""
+        emit = self.event_bus.emit
         # DOTs on characters (from boss abilities)
         for char in characters:
             if not char.alive:
                 continue
-            for debuff in list(char.debuffs):
+            # Iterated live: nothing below adds or removes debuffs (take_damage leaves them alone)
+            for debuff in char.debuffs.values():
                 dpt = debuff.params.get("damage_per_tick", 0)
                 if dpt > 0:
                     actual = char.take_damage(int(dpt * dt))
                     if actual > 0:
-                        self.event_bus.emit(DAMAGE, {
+                        emit(DAMAGE, {
                             "source": debuff.source or "boss",
                             "target": char.id,
                             "skill": debuff.name,
@@ -379,18 +421,19 @@ class CombatSystem:
                             "is_dot": True,
                         })
                     if not char.alive:
-                        self.event_bus.emit(DEATH, {"target": char.id, "source": debuff.name})
+                        emit(DEATH, {"target": char.id, "source": debuff.name})
 
         # DOTs on boss (from player abilities like poison)
-        if hasattr(boss, "debuffs"):
-            for debuff in list(boss.debuffs):
+        if boss.debuffs:
+            add_threat = self.threat.add_threat
+            for debuff in boss.debuffs.values():
                 dpt = debuff.params.get("damage_per_tick", 0)
                 if dpt > 0:
                     actual = boss.take_damage(int(dpt * dt))
                     if actual > 0:
                         source_id = debuff.source or "unknown"
-                        self.threat.add_threat(source_id, actual)
-                        self.event_bus.emit(DAMAGE, {
+                        add_threat(source_id, actual)
+                        emit(DAMAGE, {
                             "source": source_id,
                             "target": "boss",
                             "skill": debuff.name,
@@ -423,23 +466,24 @@ class CombatSystem:
     def boss_aoe_attack(self, boss: Any, targets: list[Character], damage: int, skill_name: str) -> int:
         """Boss AOE attack on all living characters."""
         total = 0
+        emit = self.event_bus.emit
         for t in targets:
             if not t.alive:
                 continue
             actual = t.take_damage(damage)
             total += actual
-            self.event_bus.emit(DAMAGE, {
+            emit(DAMAGE, {
                 "source": "boss", "target": t.id,
                 "skill": skill_name, "amount": actual,
             })
             if not t.alive:
-                self.event_bus.emit(DEATH, {"target": t.id, "source": skill_name})
-                self.event_bus.emit(COMBAT_LOG, {
+                emit(DEATH, {"target": t.id, "source": skill_name})
+                emit(COMBAT_LOG, {
                     "message": f"☠ {t.name} 被 {skill_name} 击杀!",
                     "type": "damage",
                 })
         if total > 0:
-            self.event_bus.emit(COMBAT_LOG, {
+            emit(COMBAT_LOG, {
                 "message": f"[Boss] {skill_name} AOE → 全体 -{damage} (总{total})",
                 "type": "damage",
             })
@@ -450,16 +494,17 @@ class CombatSystem:
     # ------------------------------------------------------------------
     def process_hots(self, characters: list[Character], dt: float) -> None:
         """Process HoT effects from buffs on characters each tick."""
+        emit = self.event_bus.emit
         for char in characters:
             if not char.alive:
                 continue
-            for buff in char.buffs:
+            for buff in char.buffs.values():
                 hot = buff.params.get("hot_per_second", 0)
                 if hot > 0:
                     heal_amount = int(hot * dt)
                     actual = char.receive_heal(heal_amount)
                     if actual > 0:
-                        self.event_bus.emit(HEAL, {
+                        emit(HEAL, {
                             "source": buff.source or char.id,
                             "target": char.id,
                             "skill": f"{buff.name}(HoT)",
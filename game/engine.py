@@ -4,26 +4,58 @@ from __future__ import annotations
 
 import asyncio
 import logging
-import random
 import time
+from collections import deque
 from typing import Any, Callable
 
-from game.boss import Boss
-from game.character import Character, Debuff, create_character
+from game.boss import Boss, Fissure, Trap
+from game.character import Buff, Character, Debuff, create_character
 from game.combat import CombatSystem
 from game.events import (
     BOSS_CAST, COMBAT_LOG, DAMAGE, DEATH, DEFEAT, VICTORY, EventBus,
 )
-from game.skills import SKILLS, get_skill
+from game.skills import SkillDef, get_skill
 
 logger = logging.getLogger(__name__)
 
 TICK_INTERVAL = 0.25  # 250ms per tick (4 ticks/sec for smoother gameplay)
+GOD_COMMAND_QUEUE_MAX = 64  # oldest queued god commands are dropped beyond this (spam guard)
+
+# tick_complete deltas: keys always sent, and keys holding one entity dict
+# (diffed per field, like each entry of "characters"); the rest are sent whole.
+_ALWAYS_BROADCAST = frozenset(("tick", "combat_log"))
+_ENTITY_KEYS = frozenset(("boss", "boss_card"))
+
+# Player skill log suffix: first result key present wins (checked in this order)
+_SKILL_LOG_DETAIL = (
+    ("damage", " -{}"),
+    ("total_damage", " -{}"),
+    ("heal", " +{}"),
+    ("total_heal", " +{}"),
+    ("taunt_duration", " 强制攻击{}秒"),
+    ("buff", " [{}]"),
+    ("debuff", " [{}]"),
+)
+
+
+def _changed_fields(new: dict[str, Any], old: dict[str, Any] | None) -> dict[str, Any]:
+    """Fields of one entity dict that differ from its previous broadcast."""
+    if not old:
+        return new
+    return {k: v for k, v in new.items() if k not in old or old[k] != v}
 
 
 class GameEngine:
     """Core game engine driving the raid encounter."""
 
+    __slots__ = (
+        "event_bus", "events", "combat", "boss", "characters", "_char_list",
+        "_pending_actions", "_god_commands", "god_command_text", "_god_command_time",
+        "running", "_paused", "tick_count", "game_time", "result",
+        "_on_state_change", "_on_combat_log", "_last_log_index", "_snapshot", "_last_broadcast",
+        "_agents", "_boss_skill_handlers", "_god_handlers",
+    )
+
     def __init__(self, boss_config: dict | None = None) -> None:
         self.event_bus = EventBus()
         self.events = self.event_bus  # alias for main.py compatibility
@@ -35,36 +67,82 @@ class GameEngine:
         for role in ("tank", "healer", "mage", "rogue", "hunter"):
             char = create_character(role, role)
             self.characters[role] = char
+        # Stable list view of self.characters (the roster only changes in reset_game)
+        self._char_list: list[Character] = list(self.characters.values())
 
-        # Pending actions submitted by agents: list of (character_id, skill_id, target_id)
-        self._pending_actions: list[tuple[str, int, str]] = []
+        # Pending actions submitted by agents: (entity, skill, target_id), resolved
+        # once in submit_action; the queue is cleared whenever entities are replaced
+        self._pending_actions: list[tuple[Character | Boss, SkillDef, str]] = []
 
-        # God commands queue
-        self._god_commands: list[str] = []
+        # God commands queue (bounded; drained once per tick)
+        self._god_commands: deque[str] = deque(maxlen=GOD_COMMAND_QUEUE_MAX)
         # Latest god command text (for agent prompts)
         self.god_command_text: str = ""
         self._god_command_time: float = 0.0  # game_time when set
 
         # Game state
         self.running = False
+        self._paused = False  # god "pause": loop stays alive, simulation frozen
         self.tick_count = 0
         self.game_time = 0.0  # seconds elapsed
         self.result: str | None = None  # "victory" | "defeat"
 
         # Callbacks for state broadcast
-        self._on_state_change: list[Callable[[dict], None]] = []
+        # Copy-on-write tuple: _broadcast_state iterates it directly, and a callback
+        # (un)registering mid-broadcast only affects the next tick
+        self._on_state_change: tuple[Callable[[dict], None], ...] = ()
         self._on_combat_log: list[Callable[[dict], None]] = []
 
         # Log index for incremental fetching
         self._last_log_index = 0
 
+        # Entity part of the state snapshot, shared by the get_*state views until the next tick
+        self._snapshot: dict[str, Any] | None = None
+        # Last state broadcast on tick_complete; the next tick only sends what differs
+        self._last_broadcast: dict[str, Any] = {}
+
         # Agent references for AI Log
         self._agents: list[Any] = []
 
+        # Boss skill id -> handler(skill, target character or None)
+        self._boss_skill_handlers: dict[int, Callable[[SkillDef, Character | None], None]] = {
+            601: self._boss_auto_attack,
+            602: self._boss_cleave,
+            603: self._boss_magma_blast,
+            604: self._boss_firestorm,
+            605: self._boss_summon,
+            606: self._boss_fissure,
+            607: self._boss_apocalypse,
+            608: self._boss_trap,
+            609: self._boss_heal_reduction,
+            610: self._boss_fire_shield,
+            611: self._boss_thrust,
+        }
+
+        # God command keyword -> (min args, maxsplit, handler(args)); args are the
+        # words after the keyword, split at most maxsplit times (0 = raw remainder).
+        # Too few args falls through to the natural-language broadcast.
+        self._god_handlers: dict[str, tuple[int, int, Callable[[list[str]], None]]] = {
+            "damage": (2, 2, self._god_damage),
+            "heal": (2, 2, self._god_heal),
+            "kill": (1, 1, self._god_kill),
+            "resurrect": (1, 1, self._god_resurrect),
+            "phase": (1, 1, self._god_phase),
+            "buff": (2, 3, self._god_buff),
+            "say": (0, 0, self._god_say),
+            "pause": (0, 0, self._god_pause),
+            "resume": (0, 0, self._god_resume),
+        }
+
     @property
     def is_running(self) -> bool:
         return self.running
 
+    @property
+    def is_paused(self) -> bool:
+        """True while a god "pause" holds the running game (agents idle meanwhile)."""
+        return self.running and self._paused
+
     # ------------------------------------------------------------------
     # Agent injection (for AI Log)
     # ------------------------------------------------------------------
@@ -100,6 +178,7 @@ class GameEngine:
             self.reset_game()
 
         self.running = True
+        self._paused = False
         self.tick_count = 0
         self.game_time = 0.0
         self.result = None
@@ -127,6 +206,7 @@ class GameEngine:
     def reset_game(self) -> None:
         """Reset all game state for a fresh start."""
         self.running = False
+        self._paused = False
         self.tick_count = 0
         self.game_time = 0.0
         self.result = None
@@ -134,7 +214,9 @@ class GameEngine:
         self._god_commands.clear()
         self.god_command_text = ""
         self._last_log_index = 0
-        self.event_bus._log.clear()
+        self._snapshot = None
+        self._last_broadcast = {}
+        self.event_bus.clear_log()
 
         # Reset boss
         self.boss = Boss(self.event_bus)
@@ -142,6 +224,7 @@ class GameEngine:
         # Reset characters
         for role in list(self.characters.keys()):
             self.characters[role] = create_character(role, role)
+        self._char_list = list(self.characters.values())
 
         # Reset combat system
         self.combat = CombatSystem(self.event_bus)
@@ -150,18 +233,30 @@ class GameEngine:
 
     async def game_loop(self) -> None:
         """Main game loop running at TICK_INTERVAL."""
+        # Ticks are scheduled against absolute deadlines, so oversleeping one
+        # tick shortens the next sleep instead of drifting game_time behind.
+        next_tick = time.monotonic()
         while self.running:
-            tick_start = time.monotonic()
-            self.process_tick()
+            if self._paused:
+                # Frozen: only god commands are handled, so "resume" can arrive
+                if self._god_commands:
+                    self._process_god_commands()
+                    # Their state changes and log lines go out now, not on resume
+                    self._snapshot = None
+                    self._broadcast_state()
+            else:
+                self.process_tick()
 
-            if self.result:
-                self.running = False
-                break
+                if self.result:
+                    self.running = False
+                    break
 
-            # Sleep for remaining time in tick
-            elapsed = time.monotonic() - tick_start
-            sleep_time = max(0, TICK_INTERVAL - elapsed)
-            await asyncio.sleep(sleep_time)
+            next_tick += TICK_INTERVAL
+            now = time.monotonic()
+            if now - next_tick > TICK_INTERVAL:
+                # More than a tick behind (stalled loop): resync rather than burst
+                next_tick = now
+            await asyncio.sleep(max(0.0, next_tick - now))
 
         logger.info("Game loop ended. Result: %s", self.result)
 
@@ -170,6 +265,7 @@ class GameEngine:
         dt = TICK_INTERVAL
         self.tick_count += 1
         self.game_time += dt
+        self._snapshot = None
 
         # 1. Process timers (GCD, cooldowns, buff/debuff durations) - characters + boss
         self._tick_timers(dt)
@@ -178,8 +274,9 @@ class GameEngine:
         self._process_boss_passive(dt)
 
         # 3. Process DOTs and HOTs
-        self.combat.process_dots(list(self.characters.values()), self.boss, dt)
-        self.combat.process_hots(list(self.characters.values()), dt)
+        chars = self._char_list
+        self.combat.process_dots(chars, self.boss, dt)
+        self.combat.process_hots(chars, dt)
 
         # 4. Process casting completions (characters + boss)
         self._process_casts(dt)
@@ -209,14 +306,12 @@ class GameEngine:
     # ------------------------------------------------------------------
     def submit_action(self, character_id: str, skill_id: int, target: str = "") -> bool:
         """Submit a player or boss action. Returns True if accepted into queue."""
-        # Get entity (character or boss)
-        if character_id == "boss":
+        # Get entity: characters are the common case, the boss the fallback
+        entity = self.characters.get(character_id)
+        if entity is None:
+            if character_id != "boss":
+                return False
             entity = self.boss
-        else:
-            entity = self.characters.get(character_id)
-
-        if not entity:
-            return False
 
         skill = get_skill(skill_id)
         if not skill:
@@ -226,7 +321,7 @@ class GameEngine:
         if not can_use:
             return False
 
-        self._pending_actions.append((character_id, skill_id, target))
+        self._pending_actions.append((entity, skill, target))
         return True
 
     def submit_god_command(self, command: str) -> None:
@@ -236,24 +331,35 @@ class GameEngine:
     def get_character(self, character_id: str) -> Character | None:
         return self.characters.get(character_id)
 
+    def _entity_state(self) -> dict[str, Any]:
+        """Boss/character/threat/adds part of the state, built once per tick.
+
+        Shared by get_game_state, get_state_for_agent and get_full_state
+        (process_tick and reset_game drop it); callers must treat it as read-only.
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            living = [c for c in self._char_list if c.alive]
+            snapshot = self._snapshot = {
+                "boss": self.boss.to_dict(),
+                "boss_card": self.boss.to_card_dict(),
+                "characters": {cid: c.to_dict() for cid, c in self.characters.items()},
+                "threat": self.combat.threat.get_threat_list(),
+                "adds": [a.to_dict() for a in self.boss.live_adds],
+                "living_count": len(living),
+            }
+        return snapshot
+
     def get_game_state(self) -> dict[str, Any]:
         """Return game state snapshot with incremental combat log."""
-        new_logs = self.event_bus.get_log(self._last_log_index)
-        self._last_log_index = len(self.event_bus._log)
-
-        living = [c for c in self.characters.values() if c.alive]
+        new_logs, self._last_log_index = self.event_bus.get_log_tail(self._last_log_index)
 
         return {
             "tick": self.tick_count,
             "game_time": round(self.game_time, 1),
             "running": self.running,
             "result": self.result,
-            "boss": self.boss.to_dict(),
-            "boss_card": self.boss.to_card_dict(),
-            "characters": {cid: c.to_dict() for cid, c in self.characters.items()},
-            "threat": self.combat.threat.get_threat_list(),
-            "adds": [a.to_dict() for a in self.boss.adds if a.alive],
-            "living_count": len(living),
+            **self._entity_state(),
             "combat_log": new_logs,
             "god_command": self.god_command_text,
             "ai_log": self._get_ai_log(),
@@ -261,113 +367,83 @@ class GameEngine:
 
     def get_state_for_agent(self) -> dict[str, Any]:
         """Return game state snapshot for agent prompts (does NOT consume logs)."""
-        living = [c for c in self.characters.values() if c.alive]
-
         return {
             "tick": self.tick_count,
             "game_time": round(self.game_time, 1),
             "running": self.running,
             "result": self.result,
-            "boss": self.boss.to_dict(),
-            "boss_card": self.boss.to_card_dict(),
-            "characters": {cid: c.to_dict() for cid, c in self.characters.items()},
-            "threat": self.combat.threat.get_threat_list(),
-            "adds": [a.to_dict() for a in self.boss.adds if a.alive],
-            "living_count": len(living),
+            **self._entity_state(),
             "god_command": self.god_command_text,
         }
 
     def get_full_state(self) -> dict[str, Any]:
         """Full state including all logs (for initial connection)."""
-        living = [c for c in self.characters.values() if c.alive]
-
         return {
             "tick": self.tick_count,
             "game_time": round(self.game_time, 1),
             "running": self.running,
             "result": self.result,
-            "boss": self.boss.to_dict(),
-            "boss_card": self.boss.to_card_dict(),
-            "characters": {cid: c.to_dict() for cid, c in self.characters.items()},
-            "threat": self.combat.threat.get_threat_list(),
-            "adds": [a.to_dict() for a in self.boss.adds if a.alive],
-            "living_count": len(living),
+            **self._entity_state(),
             "combat_log": self.event_bus.get_log(),
             "god_command": self.god_command_text,
             "ai_log": self._get_ai_log(),
         }
 
     def register_state_callback(self, cb: Callable[[dict], None]) -> None:
-        self._on_state_change.append(cb)
+        self._on_state_change += (cb,)
 
     def unregister_state_callback(self, cb: Callable[[dict], None]) -> None:
-        try:
-            self._on_state_change.remove(cb)
-        except ValueError:
-            pass
+        callbacks = self._on_state_change
+        if cb in callbacks:
+            i = callbacks.index(cb)
+            self._on_state_change = callbacks[:i] + callbacks[i + 1:]
 
     # ------------------------------------------------------------------
     # Internal processing
     # ------------------------------------------------------------------
     def _tick_timers(self, dt: float) -> None:
         """Advance character and boss timers."""
+        emit = self.event_bus.emit
         # Character timers
-        for char in self.characters.values():
-            expired = char.tick_timers(dt)
-            for exp in expired:
-                kind, bid = exp.split(":", 1)
-                self.event_bus.emit(
-                    "buff_expire",
-                    {"target": char.id, f"{kind}_id": bid, "reason": "expired"},
-                )
+        for char in self._char_list:
+            for key, bid in char.tick_timers(dt):
+                emit("buff_expire", {"target": char.id, key: bid, "reason": "expired"})
         # Boss timers
-        boss_expired = self.boss.tick_timers(dt)
-        for exp in boss_expired:
-            kind, bid = exp.split(":", 1)
-            self.event_bus.emit(
-                "buff_expire",
-                {"target": "boss", f"{kind}_id": bid, "reason": "expired"},
-            )
+        for key, bid in self.boss.tick_timers(dt):
+            emit("buff_expire", {"target": "boss", key: bid, "reason": "expired"})
 
     def _process_boss_passive(self, dt: float) -> None:
         """Tick boss passive mechanics (fissures, traps, adds)."""
-        self.boss.tick_passive(dt, list(self.characters.values()))
+        self.boss.tick_passive(dt, self._char_list)
 
     def _process_casts(self, dt: float) -> None:
         """Check if any character or boss finished casting."""
         # Character casts
         for char in self.characters.values():
-            if not char.casting:
-                continue
-            if char.casting["remaining"] <= 0:
-                skill = char.casting["skill"]
-                target_id = char.casting["target"]
+            cast = char.casting
+            if cast is not None and cast.remaining <= 0:
                 char.casting = None
-                self._execute_skill(char, skill, target_id)
+                self._execute_skill(char, cast.skill, cast.target)
 
         # Boss casts
-        if self.boss.casting and self.boss.casting["remaining"] <= 0:
-            skill = self.boss.casting["skill"]
-            target_id = self.boss.casting["target"]
+        cast = self.boss.casting
+        if cast is not None and cast.remaining <= 0:
             self.boss.casting = None
-            self._execute_boss_skill(skill, target_id)
+            self._execute_boss_skill(cast.skill, cast.target)
 
     def _process_pending_actions(self) -> None:
         """Resolve all queued actions (characters + boss unified)."""
-        actions = list(self._pending_actions)
-        self._pending_actions.clear()
+        actions = self._pending_actions
+        if not actions:
+            return
+        # Swap in a fresh queue instead of copying and clearing the old one
+        self._pending_actions = []
 
-        for char_id, skill_id, target_id in actions:
-            # Get entity
-            if char_id == "boss":
-                entity = self.boss
-            else:
-                entity = self.characters.get(char_id)
-            skill = get_skill(skill_id)
-            if not entity or not skill:
-                continue
+        boss = self.boss
+        emit = self.event_bus.emit
 
-            # Re-check usability (state may have changed)
+        for entity, skill, target_id in actions:
+            # Re-check usability (state may have changed since submit_action)
             can_use, reason = entity.can_use_skill(skill)
             if not can_use:
                 continue
@@ -383,17 +459,16 @@ class GameEngine:
             # If skill has a cast time, start casting
             if skill.cast_time > 0:
                 entity.start_cast(skill, target_id)
-                entity_name = getattr(entity, "name", char_id)
-                self.event_bus.emit(COMBAT_LOG, {
-                    "message": f"[{entity_name}] 开始施放 {skill.name}...",
+                emit(COMBAT_LOG, {
+                    "message": f"[{entity.name}] 开始施放 {skill.name}...",
                 })
-                if char_id == "boss":
-                    self.event_bus.emit(BOSS_CAST, {
+                if entity is boss:
+                    emit(BOSS_CAST, {
                         "skill": skill.name, "cast_time": skill.cast_time,
                         "message": f"{skill.name}正在读条! {'必须打断!' if skill.id == 607 else ''}",
                     })
             else:
-                if char_id == "boss":
+                if entity is boss:
                     self._execute_boss_skill(skill, target_id)
                 else:
                     self._execute_skill(entity, skill, target_id)
@@ -402,20 +477,17 @@ class GameEngine:
         """Execute a resolved player skill."""
         # Determine target
         target = None
-        all_allies = [c for c in self.characters.values() if c.alive]
-        all_enemies: list = [self.boss] + [a for a in self.boss.adds if a.alive]
+        # Only damage AOEs read the enemy list; live_adds is kept current by add deaths
+        all_enemies = (
+            [self.boss, *self.boss.live_adds] if skill.effect_type == "damage_aoe" else None
+        )
 
         if skill.target_type == "enemy":
             if target_id == "boss" or not target_id:
                 target = self.boss
             else:
-                # Could be an add
-                for add in self.boss.adds:
-                    if add.id == target_id and add.alive:
-                        target = add
-                        break
-                if target is None:
-                    target = self.boss
+                # Could be a living add; anything else falls back to the boss
+                target = self.boss.live_adds_by_id.get(target_id, self.boss)
         elif skill.target_type == "self":
             target = char
         elif skill.target_type == "ally":
@@ -427,7 +499,7 @@ class GameEngine:
             caster=char,
             skill=skill,
             target=target,
-            all_allies=list(self.characters.values()),
+            all_allies=self._char_list,
             all_enemies=all_enemies,
         )
 
@@ -435,241 +507,258 @@ class GameEngine:
         target_name = getattr(target, 'name', target_id) if target else '全体'
         detail = ""
         if result:
-            if "damage" in result:
-                detail = f" -{result['damage']}"
-            elif "total_damage" in result:
-                detail = f" -{result['total_damage']}"
-            elif "heal" in result:
-                detail = f" +{result['heal']}"
-            elif "total_heal" in result:
-                detail = f" +{result['total_heal']}"
-            elif "taunt_duration" in result:
-                detail = f" 强制攻击{result['taunt_duration']}秒"
-            elif "buff" in result:
-                detail = f" [{result['buff']}]"
-            elif "debuff" in result:
-                detail = f" [{result['debuff']}]"
+            for key, fmt in _SKILL_LOG_DETAIL:
+                if key in result:
+                    detail = fmt.format(result[key])
+                    break
 
         self.event_bus.emit(COMBAT_LOG, {
             "message": f"[{char.name}] 使用 {skill.name} → {target_name}{detail}",
         })
 
-    def _execute_boss_skill(self, skill, target_id: str) -> None:
-        """Execute a boss skill."""
-        living = [c for c in self.characters.values() if c.alive]
-        target = self.characters.get(target_id)
-
-        if skill.id == 601:  # 普攻
-            if target and target.alive:
-                damage = random.randint(self.boss.attack_min, self.boss.attack_max)
-                self.combat.boss_attack(self.boss, target, damage, "普攻")
-
-        elif skill.id == 602:  # 顺劈斩
-            if target and target.alive:
-                dmg = skill.effects.get("base_damage", 700)
-                self.combat.boss_attack(self.boss, target, dmg, "顺劈斩")
-
-        elif skill.id == 603:  # 岩浆喷射
-            if target and target.alive:
-                dmg = skill.effects.get("base_damage", 450)
-                self.combat.boss_attack(self.boss, target, dmg, "岩浆喷射")
-                dot = Debuff(
-                    debuff_id="magma_burn",
-                    name="岩浆灼烧",
-                    duration=skill.effects.get("dot_duration", 5),
-                    params={"damage_per_tick": skill.effects.get("dot_damage", 60), "source": "boss"},
-                    source="boss",
-                )
-                target.add_debuff(dot)
-                self.event_bus.emit(COMBAT_LOG, {
-                    "message": f"岩浆喷射命中{target.name}! 灼烧DOT {skill.effects.get('dot_damage', 60)}/s",
-                })
-
-        elif skill.id == 604:  # 烈焰风暴
-            aoe_dmg = skill.effects.get("base_damage", 400)
-            self.combat.boss_aoe_attack(self.boss, living, aoe_dmg, "烈焰风暴")
+    def _living_characters(self) -> list[Character]:
+        """Characters still alive right now (not cached: deaths happen mid-tick)."""
+        return [c for c in self._char_list if c.alive]
+
+    def _execute_boss_skill(self, skill: SkillDef, target_id: str) -> None:
+        """Execute a boss skill via the id -> handler table built in __init__."""
+        handler = self._boss_skill_handlers.get(skill.id)
+        if handler is not None:
+            handler(skill, self.characters.get(target_id))
+
+    def _boss_auto_attack(self, skill: SkillDef, target: Character | None) -> None:
+        """601 普攻."""
+        if target and target.alive:
+            damage = self.boss.roll_attack()
+            self.combat.boss_attack(self.boss, target, damage, "普攻")
+
+    def _boss_cleave(self, skill: SkillDef, target: Character | None) -> None:
+        """602 顺劈斩."""
+        if target and target.alive:
+            dmg = skill.effects.get("base_damage", 700)
+            self.combat.boss_attack(self.boss, target, dmg, "顺劈斩")
+
+    def _boss_magma_blast(self, skill: SkillDef, target: Character | None) -> None:
+        """603 岩浆喷射."""
+        if target and target.alive:
+            dmg = skill.effects.get("base_damage", 450)
+            self.combat.boss_attack(self.boss, target, dmg, "岩浆喷射")
+            dot = Debuff(
+                debuff_id="magma_burn",
+                name="岩浆灼烧",
+                duration=skill.effects.get("dot_duration", 5),
+                params={"damage_per_tick": skill.effects.get("dot_damage", 60), "source": "boss"},
+                source="boss",
+            )
+            target.add_debuff(dot)
             self.event_bus.emit(COMBAT_LOG, {
-                "message": f"烈焰风暴! 全体受到{aoe_dmg}伤害!",
+                "message": f"岩浆喷射命中{target.name}! 灼烧DOT {skill.effects.get('dot_damage', 60)}/s",
             })
 
-        elif skill.id == 605:  # 召唤元素
-            count = skill.effects.get("count", 3)
-            self.boss.summon_adds(count)
-            self.event_bus.emit(COMBAT_LOG, {
-                "message": f"拉格纳罗斯召唤了{count}个熔岩元素!",
-            })
+    def _boss_firestorm(self, skill: SkillDef, target: Character | None) -> None:
+        """604 烈焰风暴."""
+        living = self._living_characters()
+        aoe_dmg = skill.effects.get("base_damage", 400)
+        self.combat.boss_aoe_attack(self.boss, living, aoe_dmg, "烈焰风暴")
+        self.event_bus.emit(COMBAT_LOG, {
+            "message": f"烈焰风暴! 全体受到{aoe_dmg}伤害!",
+        })
 
-        elif skill.id == 606:  # 熔岩裂隙
-            if target and target.alive:
-                fissure = {
-                    "target_id": target.id,
-                    "duration": skill.effects.get("dot_duration", 6.0),
-                    "damage_per_tick": skill.effects.get("dot_damage", 150),
-                    "name": "熔岩裂隙",
-                }
-                self.boss.fissures.append(fissure)
-                self.event_bus.emit(BOSS_CAST, {"skill": "熔岩裂隙", "target": target.id})
-                self.event_bus.emit(COMBAT_LOG, {
-                    "message": f"熔岩裂隙出现在{target.name}脚下!",
-                })
+    def _boss_summon(self, skill: SkillDef, target: Character | None) -> None:
+        """605 召唤元素."""
+        count = skill.effects.get("count", 3)
+        self.boss.summon_adds(count)
+        self.event_bus.emit(COMBAT_LOG, {
+            "message": f"拉格纳罗斯召唤了{count}个熔岩元素!",
+        })
 
-        elif skill.id == 607:  # 灭世之炎 (cast completed)
-            apoc_dmg = skill.effects.get("base_damage", 8000)
-            self.combat.boss_aoe_attack(self.boss, living, apoc_dmg, "灭世之炎")
+    def _boss_fissure(self, skill: SkillDef, target: Character | None) -> None:
+        """606 熔岩裂隙."""
+        if target and target.alive:
+            self.boss.fissures.append(Fissure(
+                target=target,
+                duration=skill.effects.get("dot_duration", 6.0),
+                damage_per_tick=skill.effects.get("dot_damage", 150),
+            ))
+            self.event_bus.emit(BOSS_CAST, {"skill": "熔岩裂隙", "target": target.id})
             self.event_bus.emit(COMBAT_LOG, {
-                "message": f"灭世之炎释放! 全体受到{apoc_dmg}伤害!",
+                "message": f"熔岩裂隙出现在{target.name}脚下!",
             })
 
-        elif skill.id == 608:  # 熔岩陷阱
-            if target and target.alive:
-                trap = {
-                    "target_id": target.id,
-                    "countdown": skill.effects.get("countdown", 5.0),
-                    "damage": skill.effects.get("damage", 1500),
-                    "name": "熔岩陷阱",
-                }
-                self.boss.traps.append(trap)
-                self.event_bus.emit(BOSS_CAST, {
-                    "skill": "熔岩陷阱", "target": target.id,
-                    "message": f"熔岩陷阱标记了{target.name}! 5秒后爆炸!",
-                })
-                self.event_bus.emit(COMBAT_LOG, {
-                    "message": f"熔岩陷阱标记了{target.name}! 5秒后爆炸!",
-                })
+    def _boss_apocalypse(self, skill: SkillDef, target: Character | None) -> None:
+        """607 灭世之炎 (cast completed)."""
+        living = self._living_characters()
+        apoc_dmg = skill.effects.get("base_damage", 8000)
+        self.combat.boss_aoe_attack(self.boss, living, apoc_dmg, "灭世之炎")
+        self.event_bus.emit(COMBAT_LOG, {
+            "message": f"灭世之炎释放! 全体受到{apoc_dmg}伤害!",
+        })
 
-        elif skill.id == 609:  # 禁疗之焰
-            for c in living:
-                debuff = Debuff(
-                    debuff_id="heal_reduction",
-                    name="禁疗之焰",
-                    duration=skill.effects.get("duration", 8),
-                    params={"heal_reduction": skill.effects.get("heal_reduction", 0.75)},
-                    source="boss",
-                )
-                c.add_debuff(debuff)
+    def _boss_trap(self, skill: SkillDef, target: Character | None) -> None:
+        """608 熔岩陷阱."""
+        if target and target.alive:
+            self.boss.traps.append(Trap(
+                target=target,
+                countdown=skill.effects.get("countdown", 5.0),
+                damage=skill.effects.get("damage", 1500),
+            ))
+            self.event_bus.emit(BOSS_CAST, {
+                "skill": "熔岩陷阱", "target": target.id,
+                "message": f"熔岩陷阱标记了{target.name}! 5秒后爆炸!",
+            })
             self.event_bus.emit(COMBAT_LOG, {
-                "message": f"禁疗之焰! 全体治疗效果降低{int(skill.effects.get('heal_reduction', 0.75) * 100)}%持续{skill.effects.get('duration', 8)}秒!",
+                "message": f"熔岩陷阱标记了{target.name}! 5秒后爆炸!",
             })
 
-        elif skill.id == 610:  # 火焰盾
-            from game.character import Buff
-            buff = Buff(
-                buff_id="fire_shield",
-                name="火焰盾",
-                duration=skill.effects.get("duration", 10),
-                params={"damage_reflect": skill.effects.get("damage_reflect", 0.3)},
+    def _boss_heal_reduction(self, skill: SkillDef, target: Character | None) -> None:
+        """609 禁疗之焰."""
+        living = self._living_characters()
+        for c in living:
+            debuff = Debuff(
+                debuff_id="heal_reduction",
+                name="禁疗之焰",
+                duration=skill.effects.get("duration", 8),
+                params={"heal_reduction": skill.effects.get("heal_reduction", 0.75)},
                 source="boss",
             )
-            self.boss.add_buff(buff)
+            c.add_debuff(debuff)
+        self.event_bus.emit(COMBAT_LOG, {
+            "message": f"禁疗之焰! 全体治疗效果降低{int(skill.effects.get('heal_reduction', 0.75) * 100)}%持续{skill.effects.get('duration', 8)}秒!",
+        })
+
+    def _boss_fire_shield(self, skill: SkillDef, target: Character | None) -> None:
+        """610 火焰盾."""
+        buff = Buff(
+            buff_id="fire_shield",
+            name="火焰盾",
+            duration=skill.effects.get("duration", 10),
+            params={"damage_reflect": skill.effects.get("damage_reflect", 0.3)},
+            source="boss",
+        )
+        self.boss.add_buff(buff)
+        self.event_bus.emit(COMBAT_LOG, {
+            "message": f"火焰盾! Boss反弹{int(skill.effects.get('damage_reflect', 0.3) * 100)}%伤害持续{skill.effects.get('duration', 10)}秒!",
+        })
+
+    def _boss_thrust(self, skill: SkillDef, target: Character | None) -> None:
+        """611 熔火突刺 (cast completed)."""
+        if target and target.alive:
+            dmg = skill.effects.get("base_damage", 5000)
+            self.combat.boss_attack(self.boss, target, dmg, "熔火突刺")
             self.event_bus.emit(COMBAT_LOG, {
-                "message": f"火焰盾! Boss反弹{int(skill.effects.get('damage_reflect', 0.3) * 100)}%伤害持续{skill.effects.get('duration', 10)}秒!",
+                "message": f"熔火突刺命中{target.name}! {dmg}伤害! {'盾墙减伤!' if target.has_buff('shield_wall') else '没开盾墙!'}",
             })
 
-        elif skill.id == 611:  # 熔火突刺 (cast completed)
-            if target and target.alive:
-                dmg = skill.effects.get("base_damage", 5000)
-                self.combat.boss_attack(self.boss, target, dmg, "熔火突刺")
-                self.event_bus.emit(COMBAT_LOG, {
-                    "message": f"熔火突刺命中{target.name}! {dmg}伤害! {'盾墙减伤!' if target.has_buff('shield_wall') else '没开盾墙!'}",
-                })
-
     def _process_god_commands(self) -> None:
         """Process DM/God commands."""
-        commands = list(self._god_commands)
-        self._god_commands.clear()
+        commands = self._god_commands
+        if not commands:
+            return
+        self._god_commands = deque(maxlen=GOD_COMMAND_QUEUE_MAX)
 
         for cmd in commands:
             self._execute_god_command(cmd)
 
     def _execute_god_command(self, command: str) -> None:
         """Parse and execute a god command."""
-        parts = command.strip().split()
-        if not parts:
+        head = command.split(None, 1)
+        if not head:
             return
 
-        cmd = parts[0].lower()
-
-        if cmd == "damage" and len(parts) >= 3:
-            target_id = parts[1]
-            amount = int(parts[2])
-            target = self.characters.get(target_id)
-            if target:
-                target.take_damage(amount)
-                self.event_bus.emit(COMBAT_LOG, {
-                    "message": f"[God] {target.name}受到{amount}伤害",
-                })
-            elif target_id == "boss":
-                self.boss.take_damage(amount)
-                self.event_bus.emit(COMBAT_LOG, {
-                    "message": f"[God] Boss受到{amount}伤害",
-                })
+        entry = self._god_handlers.get(head[0].lower())
+        if entry is not None:
+            min_args, maxsplit, handler = entry
+            args = head[1].split(None, maxsplit) if len(head) > 1 else []
+            if len(args) >= min_args:
+                handler(args)
+                return
+
+        # Unrecognized commands are treated as natural language broadcast
+        self.god_command_text = command
+        self._god_command_time = self.game_time
+        self.event_bus.emit(COMBAT_LOG, {
+            "message": f"[团长指令] {command}",
+        })
 
-        elif cmd == "heal" and len(parts) >= 3:
-            target_id = parts[1]
-            amount = int(parts[2])
-            target = self.characters.get(target_id)
-            if target:
-                target.receive_heal(amount)
-                self.event_bus.emit(COMBAT_LOG, {
-                    "message": f"[God] {target.name}恢复{amount}HP",
-                })
+    def _god_damage(self, args: list[str]) -> None:
+        """damage <target> <amount>."""
+        target_id = args[0]
+        amount = int(args[1])
+        target = self.characters.get(target_id)
+        if target:
+            target.take_damage(amount)
+            self.event_bus.emit(COMBAT_LOG, {
+                "message": f"[God] {target.name}受到{amount}伤害",
+            })
+        elif target_id == "boss":
+            self.boss.take_damage(amount)
+            self.event_bus.emit(COMBAT_LOG, {
+                "message": f"[God] Boss受到{amount}伤害",
+            })
 
-        elif cmd == "kill" and len(parts) >= 2:
-            target_id = parts[1]
-            if target_id == "boss":
-                self.boss.hp = 0
-                self.boss.alive = False
-            else:
-                target = self.characters.get(target_id)
-                if target:
-                    target.die()
+    def _god_heal(self, args: list[str]) -> None:
+        """heal <target> <amount>."""
+        amount = int(args[1])
+        target = self.characters.get(args[0])
+        if target:
+            target.receive_heal(amount)
+            self.event_bus.emit(COMBAT_LOG, {
+                "message": f"[God] {target.name}恢复{amount}HP",
+            })
 
-        elif cmd == "resurrect" and len(parts) >= 2:
-            target_id = parts[1]
+    def _god_kill(self, args: list[str]) -> None:
+        """kill <target>."""
+        target_id = args[0]
+        if target_id == "boss":
+            self.boss.hp = 0
+            self.boss.alive = False
+        else:
             target = self.characters.get(target_id)
             if target:
-                target.resurrect(1.0)
-                self.event_bus.emit(COMBAT_LOG, {
-                    "message": f"[God] {target.name}被复活(满血)",
-                })
-
-        elif cmd == "phase" and len(parts) >= 2:
-            phase = int(parts[1])
-            if phase in (1, 2, 3):
-                self.boss.phase = phase
-                self.event_bus.emit(COMBAT_LOG, {
-                    "message": f"[God] 强制切换到Phase {phase}",
-                })
+                target.die()
 
-        elif cmd == "buff" and len(parts) >= 3:
-            target_id = parts[1]
-            buff_id = parts[2]
-            duration = float(parts[3]) if len(parts) > 3 else 30
-            target = self.characters.get(target_id)
-            if target:
-                from game.character import Buff
-                target.add_buff(Buff(buff_id=buff_id, name=buff_id, duration=duration))
+    def _god_resurrect(self, args: list[str]) -> None:
+        """resurrect <target> (full HP)."""
+        target = self.characters.get(args[0])
+        if target:
+            target.resurrect(1.0)
+            self.event_bus.emit(COMBAT_LOG, {
+                "message": f"[God] {target.name}被复活(满血)",
+            })
 
-        elif cmd == "say":
-            message = " ".join(parts[1:])
+    def _god_phase(self, args: list[str]) -> None:
+        """phase <1|2|3>."""
+        phase = int(args[0])
+        if phase in (1, 2, 3):
+            self.boss.force_phase(phase)
             self.event_bus.emit(COMBAT_LOG, {
-                "message": f"[DM] {message}",
+                "message": f"[God] 强制切换到Phase {phase}",
             })
 
-        elif cmd == "pause":
-            self.running = False
-            self.event_bus.emit(COMBAT_LOG, {"message": "[God] 游戏暂停"})
+    def _god_buff(self, args: list[str]) -> None:
+        """buff <target> <buff_id> [duration]."""
+        buff_id = args[1]
+        duration = float(args[2]) if len(args) > 2 else 30
+        target = self.characters.get(args[0])
+        if target:
+            target.add_buff(Buff(buff_id=buff_id, name=buff_id, duration=duration))
+
+    def _god_say(self, args: list[str]) -> None:
+        """say <message...>."""
+        message = args[0].rstrip() if args else ""
+        self.event_bus.emit(COMBAT_LOG, {
+            "message": f"[DM] {message}",
+        })
 
-        elif cmd == "resume":
-            self.event_bus.emit(COMBAT_LOG, {"message": "[God] 游戏恢复"})
+    def _god_pause(self, args: list[str]) -> None:
+        """pause (the game loop keeps running; see game_loop)."""
+        self._paused = True
+        self.event_bus.emit(COMBAT_LOG, {"message": "[God] 游戏暂停"})
 
-        else:
-            # Unrecognized commands are treated as natural language broadcast
-            self.god_command_text = command
-            self._god_command_time = self.game_time
-            self.event_bus.emit(COMBAT_LOG, {
-                "message": f"[团长指令] {command}",
-            })
+    def _god_resume(self, args: list[str]) -> None:
+        """resume."""
+        self._paused = False
+        self.event_bus.emit(COMBAT_LOG, {"message": "[God] 游戏恢复"})
 
     # ------------------------------------------------------------------
     # Win/Lose conditions
@@ -684,7 +773,7 @@ class GameEngine:
             })
             return
 
-        all_dead = all(not c.alive for c in self.characters.values())
+        all_dead = not any(c.alive for c in self._char_list)
         if all_dead:
             self.result = "defeat"
             self.event_bus.emit(DEFEAT, {
@@ -696,18 +785,62 @@ class GameEngine:
     # ------------------------------------------------------------------
     # State broadcast
     # ------------------------------------------------------------------
+    def _state_delta(self, state: dict[str, Any]) -> dict[str, Any]:
+        """What changed in ``state`` since the last broadcast.
+
+        The boss dicts and each character are diffed per field (their key sets
+        are fixed, so the client can merge field by field); tick and combat_log
+        are always included. The first broadcast after a reset is the full state.
+        """
+        last = self._last_broadcast
+        self._last_broadcast = state
+        if not last:
+            return state
+        delta: dict[str, Any] = {}
+        for key, value in state.items():
+            old = last.get(key)
+            if key in _ALWAYS_BROADCAST:
+                delta[key] = value
+            elif key in _ENTITY_KEYS:
+                changed = _changed_fields(value, old)
+                if changed:
+                    delta[key] = changed
+            elif key == "characters":
+                chars = {}
+                for cid, c in value.items():
+                    changed = _changed_fields(c, old.get(cid))
+                    if changed:
+                        chars[cid] = changed
+                if chars:
+                    delta[key] = chars
+            elif value != old:
+                delta[key] = value
+        return delta
+
     def _broadcast_state(self) -> None:
+        callbacks = self._on_state_change
+        bus = self.event_bus
+        if not (callbacks or bus.has_listeners("tick_complete") or bus.has_listeners("game_over")):
+            # Nobody is listening: skip building the state (logs stay queued for the next reader)
+            return
         state = self.get_game_state()
-        # Emit tick_complete event for server broadcast (includes combat_log)
-        self.event_bus.emit("tick_complete", state)
+        # Emit tick_complete for server broadcast: only what changed (always combat_log)
+        bus.emit("tick_complete", self._state_delta(state))
         # Check game over
         if self.result:
-            self.event_bus.emit("game_over", {
+            bus.emit("game_over", {
                 "result": self.result,
                 "message": state.get("combat_log", [{}])[-1].get("message", "") if state.get("combat_log") else "",
             })
-        for cb in self._on_state_change:
+        bad = None
+        for cb in callbacks:
             try:
                 cb(state)
             except Exception:
-                logger.exception("Error in state change callback")
+                logger.exception("Error in state change callback; unregistering it")
+                if bad is None:
+                    bad = []
+                bad.append(cb)
+        if bad:
+            for cb in bad:
+                self.unregister_state_callback(cb)
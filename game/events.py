@@ -3,11 +3,13 @@
 from __future__ import annotations
 
 import asyncio
-from collections import defaultdict
+from collections import deque
+from itertools import islice
 from typing import Any, Callable
 
 # Event type constants
 DAMAGE = "damage"
+DAMAGE_BATCH = "damage_batch"  # one AOE tick: {"source", "skill", "hits": [(target_id, amount), ...]}
 HEAL = "heal"
 BUFF_APPLY = "buff_apply"
 BUFF_EXPIRE = "buff_expire"
@@ -19,35 +21,85 @@ COMBAT_LOG = "combat_log"
 BOSS_CAST = "boss_cast"
 SUMMON = "summon"
 
+# Entries kept in the event log; older ones are dropped (log positions stay absolute)
+LOG_MAX_ENTRIES = 5000
+
 
 class EventBus:
     """Simple synchronous event bus with optional async listener support."""
 
+    __slots__ = ("_listeners", "_log", "_log_total")
+
     def __init__(self) -> None:
-        self._listeners: dict[str, list[Callable]] = defaultdict(list)
-        self._log: list[dict[str, Any]] = []
+        # Plain dict: reads on emit never create empty entries
+        self._listeners: dict[str, list[Callable]] = {}
+        self._log: deque[dict[str, Any]] = deque(maxlen=LOG_MAX_ENTRIES)
+        self._log_total = 0  # entries ever logged since the last clear_log()
 
     def on(self, event_type: str, callback: Callable) -> None:
-        self._listeners[event_type].append(callback)
+        self._listeners.setdefault(event_type, []).append(callback)
 
     def off(self, event_type: str, callback: Callable) -> None:
         try:
             self._listeners[event_type].remove(callback)
-        except ValueError:
+        except (KeyError, ValueError):
             pass
 
+    def has_listeners(self, event_type: str) -> bool:
+        """True if anything is subscribed to event_type."""
+        return bool(self._listeners.get(event_type))
+
     # Event types that should NOT be stored in the combat log
     _NO_LOG_EVENTS = {"tick_complete", "combat_log_broadcast", "game_over"}
 
     def emit(self, event_type: str, data: dict[str, Any] | None = None) -> None:
-        entry = {"type": event_type, **(data or {})}
+        entry = {"type": event_type, **data} if data else {"type": event_type}
         if event_type not in self._NO_LOG_EVENTS:
             self._log.append(entry)
-        for cb in list(self._listeners.get(event_type, [])):
-            cb(entry)
+            self._log_total += 1
+        # Most game events have no subscribers: don't copy an empty list per emit
+        listeners = self._listeners.get(event_type)
+        if listeners:
+            if len(listeners) == 1:
+                listeners[0](entry)
+            else:
+                for cb in tuple(listeners):
+                    cb(entry)
+
+    def emit_many(self, event_type: str, payloads: list[dict[str, Any]]) -> None:
+        """Emit one event per payload with a single log/listener lookup.
+
+        Listeners are still called once per entry, in payload order.
+        """
+        if not payloads:
+            return
+        entries = [{"type": event_type, **data} for data in payloads]
+        if event_type not in self._NO_LOG_EVENTS:
+            self._log.extend(entries)
+            self._log_total += len(entries)
+        listeners = self._listeners.get(event_type)
+        if listeners:
+            for cb in list(listeners):
+                for entry in entries:
+                    cb(entry)
 
     def get_log(self, since: int = 0) -> list[dict[str, Any]]:
-        return self._log[since:]
+        """Entries logged at or after absolute position since (dropped ones are gone)."""
+        log = self._log
+        count = self._log_total - since
+        if count <= 0:
+            return []
+        if count >= len(log):
+            return list(log)
+        # Only the newest entries: walk back from the right end of the deque
+        tail = list(islice(reversed(log), count))
+        tail.reverse()
+        return tail
+
+    def get_log_tail(self, since: int) -> tuple[list[dict[str, Any]], int]:
+        """Entries since the given position plus the position to resume from."""
+        return self.get_log(since), self._log_total
 
     def clear_log(self) -> None:
         self._log.clear()
+        self._log_total = 0
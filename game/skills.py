@@ -6,7 +6,7 @@ from dataclasses import dataclass, field
 from typing import Any
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class SkillDef:
     id: int
     name: str
@@ -20,6 +20,11 @@ class SkillDef:
     effects: dict[str, Any] = field(default_factory=dict)
     # auto skills are cast by the auto loop, not LLM
     auto: bool = False
+    # effects["type"], read on every resolve; filled in by __post_init__
+    effect_type: str = field(init=False, default="")
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "effect_type", self.effects.get("type", ""))
 
 
 # ---------------------------------------------------------------------------
@@ -451,16 +456,24 @@ ROLE_SKILLS: dict[str, list[SkillDef]] = {}
 for _s in ALL_SKILLS:
     ROLE_SKILLS.setdefault(_s.role, []).append(_s)
 
+# Auto / LLM-controlled partitions per role, built once (the skill table is static)
+AUTO_SKILLS_BY_ROLE: dict[str, tuple[SkillDef, ...]] = {
+    role: tuple(s for s in skills if s.auto) for role, skills in ROLE_SKILLS.items()
+}
+LLM_SKILLS_BY_ROLE: dict[str, tuple[SkillDef, ...]] = {
+    role: tuple(s for s in skills if not s.auto) for role, skills in ROLE_SKILLS.items()
+}
+
 
 def get_skill(skill_id: int) -> SkillDef | None:
     return SKILLS.get(skill_id)
 
 
-def get_auto_skills(role: str) -> list[SkillDef]:
+def get_auto_skills(role: str) -> tuple[SkillDef, ...]:
     """Return auto skills for a role."""
-    return [s for s in ROLE_SKILLS.get(role, []) if s.auto]
+    return AUTO_SKILLS_BY_ROLE.get(role, ())
 
 
-def get_llm_skills(role: str) -> list[SkillDef]:
+def get_llm_skills(role: str) -> tuple[SkillDef, ...]:
     """Return LLM-controlled skills for a role (non-auto)."""
-    return [s for s in ROLE_SKILLS.get(role, []) if not s.auto]
+    return LLM_SKILLS_BY_ROLE.get(role, ())
@@ -18,6 +18,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# libyaml's C loader when PyYAML was built with it, else the pure-Python one
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 async def main() -> None:
     load_dotenv()
@@ -31,9 +34,9 @@ async def main() -> None:
 
     # Load configs
     with open(args.team) as f:
-        team_config = yaml.safe_load(f)
+        team_config = yaml.load(f, Loader=_YamlLoader)
     with open(args.boss) as f:
-        boss_config = yaml.safe_load(f)
+        boss_config = yaml.load(f, Loader=_YamlLoader)
 
     # Import components
     from game.engine import GameEngine
@@ -48,15 +51,13 @@ async def main() -> None:
     server_module.engine = engine
 
     # Register broadcast callbacks on engine events
-    def on_tick_complete(state):
-        asyncio.ensure_future(
-            manager.broadcast({"type": "state_update", "data": state})
-        )
+    def on_tick_complete(delta):
+        # Per-tick changes only; clients merge them into the state_update sent on connect
+        manager.publish_delta(delta)
 
     def on_game_over(result):
-        asyncio.ensure_future(
-            manager.broadcast({"type": "game_over", "data": result})
-        )
+        # Same sender as the deltas, so it cannot overtake the final tick's state
+        manager.publish({"type": "game_over", "data": result})
 
     engine.event_bus.on("tick_complete", on_tick_complete)
     engine.event_bus.on("game_over", on_game_over)
@@ -78,11 +79,14 @@ async def main() -> None:
 
     logger.info("LLM config: base_url=%s model=%s", base_url or "(default)", llm_defaults.get("model"))
 
-    # Shared semaphore: allow all 6 agents concurrent LLM calls
-    llm_semaphore = asyncio.Semaphore(6)
+    # Shared semaphore: concurrent LLM calls across agents (default: all 6 at once)
+    llm_semaphore = asyncio.Semaphore(llm_defaults.get("concurrency", 6))
 
     agents: list[BaseAgent] = []
     all_members = team_config.get("members", {})
+    # Only the model varies per member, so agents on the same model share one
+    # LLMClient (and its HTTP connection pool); LLMClient keeps no per-call state
+    llm_clients: dict[str | None, LLMClient] = {}
 
     for idx, (role, member_config) in enumerate(all_members.items()):
         # Map "ranger" to "hunter" for compatibility
@@ -90,15 +94,17 @@ async def main() -> None:
         is_boss = actual_role == "boss"
 
         model = member_config.get("model", llm_defaults.get("model"))
-        llm_client = LLMClient(
-            provider=llm_defaults.get("provider", "anthropic"),
-            api_key=api_key,
-            base_url=base_url,
-            model=model,
-            temperature=llm_defaults.get("temperature", 0.3),
-            max_tokens=llm_defaults.get("max_tokens", 500),
-            timeout=llm_defaults.get("timeout", 30.0),
-        )
+        llm_client = llm_clients.get(model)
+        if llm_client is None:
+            llm_client = llm_clients[model] = LLMClient(
+                provider=llm_defaults.get("provider", "anthropic"),
+                api_key=api_key,
+                base_url=base_url,
+                model=model,
+                temperature=llm_defaults.get("temperature", 0.3),
+                max_tokens=llm_defaults.get("max_tokens", 500),
+                timeout=llm_defaults.get("timeout", 30.0),
+            )
         system_prompt = get_system_prompt(actual_role)
 
         # Boss agent uses different character_id and interval
@@ -3,13 +3,17 @@
 from __future__ import annotations
 
 import asyncio
+import gzip
+import hashlib
+import json
 import logging
+from collections import deque
 from pathlib import Path
 from typing import Any
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import Response
 
 logger = logging.getLogger(__name__)
 
@@ -19,28 +23,115 @@ app = FastAPI(title="AI副本战")
 _BASE_DIR = Path(__file__).resolve().parent.parent
 _STATIC_DIR = _BASE_DIR / "web" / "static"
 
+# The page shell is read and compressed once; reconnecting clients revalidate
+# against the ETag instead of re-downloading it
+_INDEX_BYTES = (_STATIC_DIR / "index.html").read_bytes()
+_INDEX_GZIP = gzip.compress(_INDEX_BYTES)
+_INDEX_ETAG = '"%s"' % hashlib.sha1(_INDEX_BYTES).hexdigest()
+
+# A client that cannot take a frame within this many seconds is dropped
+_SEND_TIMEOUT = 1.0
+
+
+def _merge_delta(older: dict[str, Any], newer: dict[str, Any]) -> dict[str, Any]:
+    """Fold two consecutive state deltas into one (same rules as ws.js _mergeState).
+
+    Returns a new dict; neither input (nor the engine dicts they share) is modified.
+    """
+    merged = dict(older)
+    for key, value in newer.items():
+        old = older.get(key)
+        if key == "combat_log":
+            # Each delta carries only that tick's new entries
+            merged[key] = [*(old or ()), *value]
+        elif key in ("boss", "boss_card"):
+            merged[key] = {**old, **value} if old else value
+        elif key == "characters":
+            chars = dict(old) if old else {}
+            for cid, fields in value.items():
+                prev = chars.get(cid)
+                chars[cid] = {**prev, **fields} if prev else fields
+            merged[key] = chars
+        else:
+            merged[key] = value
+    return merged
+
 
 class ConnectionManager:
     """Manages active WebSocket connections and broadcasts game state."""
 
     def __init__(self) -> None:
-        self.active_connections: list[WebSocket] = []
+        self.active_connections: set[WebSocket] = set()
+        # Per-tick deltas waiting while a previous one is still being sent
+        self._pending_delta: dict[str, Any] | None = None
+        # Messages published after the pending delta, sent in order once it is out
+        self._outbox: deque[dict[str, Any]] = deque()
+        self._delta_task: asyncio.Future | None = None
 
     async def connect(self, websocket: WebSocket) -> None:
         await websocket.accept()
-        self.active_connections.append(websocket)
+        self.active_connections.add(websocket)
 
     def disconnect(self, websocket: WebSocket) -> None:
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
+        self.active_connections.discard(websocket)
 
     async def broadcast(self, message: dict[str, Any]) -> None:
-        for connection in list(self.active_connections):
-            try:
-                await connection.send_json(message)
-            except Exception:
-                if connection in self.active_connections:
-                    self.active_connections.remove(connection)
+        if not self.active_connections:
+            return
+        # Encode once for every client (same encoding Starlette's send_json uses)
+        text = json.dumps(message, ensure_ascii=False, separators=(",", ":"))
+        # Send to all clients concurrently: one slow socket no longer delays the rest
+        await asyncio.gather(*(self._send(c, text) for c in list(self.active_connections)))
+
+    def publish_delta(self, delta: dict[str, Any]) -> None:
+        """Queue a tick's state delta for broadcast.
+
+        One sender task drains the queue; deltas that arrive while it is busy
+        are merged, so a slow client costs one backlog entry, not one per tick.
+        """
+        pending = self._pending_delta
+        self._pending_delta = delta if pending is None else _merge_delta(pending, delta)
+        self._ensure_sender()
+
+    def publish(self, message: dict[str, Any]) -> None:
+        """Queue a message behind the deltas already published (e.g. game_over)."""
+        if self._pending_delta is not None:
+            # Close off the pending delta so later ticks cannot merge past this message
+            self._outbox.append({"type": "state_delta", "data": self._pending_delta})
+            self._pending_delta = None
+        self._outbox.append(message)
+        self._ensure_sender()
+
+    def _ensure_sender(self) -> None:
+        if self._delta_task is None or self._delta_task.done():
+            self._delta_task = asyncio.ensure_future(self._send_deltas())
+
+    async def _send_deltas(self) -> None:
+        while self._outbox or self._pending_delta is not None:
+            if self._outbox:
+                await self.broadcast(self._outbox.popleft())
+            else:
+                delta, self._pending_delta = self._pending_delta, None
+                await self.broadcast({"type": "state_delta", "data": delta})
+
+    async def _send(self, connection: WebSocket, text: str) -> None:
+        try:
+            # Bounded, so one stalled socket cannot hold up the whole broadcast
+            await asyncio.wait_for(connection.send_text(text), _SEND_TIMEOUT)
+        except asyncio.TimeoutError:
+            # It has missed this delta: close it so the client reconnects and
+            # resyncs from a fresh state_update instead of drifting silently
+            self.disconnect(connection)
+            asyncio.ensure_future(self._close(connection))
+        except Exception:
+            self.disconnect(connection)
+
+    @staticmethod
+    async def _close(connection: WebSocket) -> None:
+        try:
+            await asyncio.wait_for(connection.close(code=1011), _SEND_TIMEOUT)
+        except Exception:
+            pass
 
 
 manager = ConnectionManager()
@@ -52,36 +143,45 @@ app.mount("/static", StaticFiles(directory=str(_STATIC_DIR)), name="static")
 
 
 @app.get("/")
-async def root():
-    return FileResponse(str(_STATIC_DIR / "index.html"))
+async def root(request: Request):
+    headers = {"ETag": _INDEX_ETAG, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+    if request.headers.get("if-none-match") == _INDEX_ETAG:
+        return Response(status_code=304, headers=headers)
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        headers["Content-Encoding"] = "gzip"
+        return Response(_INDEX_GZIP, media_type="text/html", headers=headers)
+    return Response(_INDEX_BYTES, media_type="text/html", headers=headers)
 
 
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
-    await manager.connect(websocket)
+    # Resolved once per connection rather than as globals on every message;
+    # main.py injects the engine before the server starts accepting sockets
+    eng, mgr = engine, manager
+    await mgr.connect(websocket)
     try:
         # Send current game state on connect
-        if engine:
-            state = engine.get_full_state()
+        if eng:
+            state = eng.get_full_state()
             await websocket.send_json({"type": "state_update", "data": state})
 
         while True:
             data = await websocket.receive_json()
             msg_type = data.get("type")
-            if msg_type == "god_command" and engine:
+            if msg_type == "god_command" and eng:
                 content = data.get("content", "")
-                engine.submit_god_command(content)
+                eng.submit_god_command(content)
                 # Broadcast the command to all clients as a log entry
-                await manager.broadcast({
+                await mgr.broadcast({
                     "type": "combat_log",
                     "data": {"message": f"[团长指令] {content}", "type": "phase"},
                 })
-            elif msg_type == "start" and engine:
-                asyncio.create_task(engine.start_game())
+            elif msg_type == "start" and eng:
+                asyncio.create_task(eng.start_game())
     except WebSocketDisconnect:
-        manager.disconnect(websocket)
+        mgr.disconnect(websocket)
     except Exception:
-        manager.disconnect(websocket)
+        mgr.disconnect(websocket)
 
 
 @app.post("/api/start")
@@ -120,10 +220,11 @@ async def game_status():
     if engine:
         return {
             "running": engine.is_running,
+            "paused": engine.is_paused,
             "result": engine.result,
             "tick": engine.tick_count,
         }
-    return {"running": False}
+    return {"running": False, "paused": False}
 
 
 @app.post("/api/god_command")
@@ -14,6 +14,7 @@ var GameWS = (function () {
   var _connected = false;
   var _gameRunning = false;
   var _activeLogFilter = 'all';
+  var _state = null;  // last known full game state (state_delta messages merge into it)
 
   // Role display config
   var ROLE_ICONS = {
@@ -600,6 +601,40 @@ var GameWS = (function () {
     container.scrollTop = container.scrollHeight;
   }
 
+  /* ---- State deltas: the server only sends what changed each tick ---- */
+  function _mergeState(delta) {
+    if (!delta) return _state;
+    if (!_state) {
+      _state = delta;
+      return _state;
+    }
+    for (var key in delta) {
+      if (!delta.hasOwnProperty(key)) continue;
+      if (key === 'boss' || key === 'boss_card') {
+        // Entity dicts arrive as changed fields only
+        _state[key] = _mergeFields(_state[key], delta[key]);
+      } else if (key === 'characters' && _state.characters) {
+        // Per character id, then per field
+        for (var cid in delta.characters) {
+          if (delta.characters.hasOwnProperty(cid)) {
+            _state.characters[cid] = _mergeFields(_state.characters[cid], delta.characters[cid]);
+          }
+        }
+      } else {
+        _state[key] = delta[key];
+      }
+    }
+    return _state;
+  }
+
+  function _mergeFields(target, fields) {
+    if (!target) return fields;
+    for (var f in fields) {
+      if (fields.hasOwnProperty(f)) target[f] = fields[f];
+    }
+    return target;
+  }
+
   /* ---- WebSocket connection ---- */
   function connect() {
     if (_ws && (_ws.readyState === WebSocket.OPEN || _ws.readyState === WebSocket.CONNECTING)) {
@@ -623,33 +658,35 @@ var GameWS = (function () {
         return;
       }
       var type = msg.type;
-      if (type === 'state_update') {
-        _emit('state_update', msg.data);
-        if (msg.data) {
-          _updateGameStatus(msg.data.running, msg.data.result);
-          _updateTimer(msg.data.game_time);
-          if (msg.data.boss) {
-            _updatePhaseBadge(msg.data.boss.phase);
+      if (type === 'state_update' || type === 'state_delta') {
+        // Full state on connect; per-tick deltas are merged into it
+        var state = type === 'state_delta' ? _mergeState(msg.data) : (_state = msg.data);
+        _emit('state_update', state);
+        if (state) {
+          _updateGameStatus(state.running, state.result);
+          _updateTimer(state.game_time);
+          if (state.boss) {
+            _updatePhaseBadge(state.boss.phase);
           }
           // Update Boss Header (fused)
           var bossAiEntry = null;
-          if (msg.data.ai_log) {
-            bossAiEntry = _updateAiChatWindows(msg.data.ai_log);
+          if (state.ai_log) {
+            bossAiEntry = _updateAiChatWindows(state.ai_log);
           }
-          if (msg.data.boss_card) {
-            _updateBossHeader(msg.data.boss_card, bossAiEntry);
+          if (state.boss_card) {
+            _updateBossHeader(state.boss_card, bossAiEntry);
           }
           // Update player cards
-          _updateCharCards(msg.data.characters);
+          _updateCharCards(state.characters);
           // Process combat logs
-          var logs = msg.data.combat_log;
+          var logs = state.combat_log;
           if (logs && logs.length) {
             for (var i = 0; i < logs.length; i++) {
               var entry = logs[i];
               var logText = entry.text || entry.message || '';
               if (logText) {
                 var finalType = _classifyLogByRole(logText);
-                _addLog(logText, finalType, msg.data.game_time);
+                _addLog(logText, finalType, state.game_time);
               }
             }
           }